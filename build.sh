@@ -6,6 +6,8 @@ python manage.py collectstatic --no-input
 
 python manage.py migrate
 
+python manage.py createcachetable
+
 # if [[$CREATE_SUPERUSER]];
 # then
 #     python manage.py createsuperuser --no-input
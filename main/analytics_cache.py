@@ -0,0 +1,116 @@
+import hashlib
+import json
+from functools import wraps
+from uuid import uuid4
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+CACHE_ALIAS = 'analytics'
+ALL_BRANCHES = '*'
+FALLBACK_BRANCH = 'Main'
+ENDPOINTS = []
+
+
+def analytics_cache():
+    return caches[CACHE_ALIAS]
+
+
+def version_key(branch):
+    return f'analytics:version:{branch}'
+
+
+def metric_key(endpoint, kind):
+    return f'analytics:metrics:{endpoint}:{kind}'
+
+
+def data_versions(branch=None):
+    # BRANCH-SCOPED RESULTS DEPEND ON THAT BRANCH PLUS MAIN, WHICH RESOURCE LISTS FALL BACK TO; OTHERS ON EVERY BRANCH
+    branches = sorted({branch, FALLBACK_BRANCH}) if branch else [ALL_BRANCHES]
+    cache = analytics_cache()
+
+    versions = cache.get_many([version_key(name) for name in branches])
+    for name in branches:
+        if version_key(name) not in versions:
+            cache.add(version_key(name), uuid4().hex, None)
+            versions[version_key(name)] = cache.get(version_key(name))
+    return [versions[version_key(name)] for name in branches]
+
+
+def bump_data_version(branches):
+    # A FRESH TOKEN RATHER THAN AN INCREMENT, SO CONCURRENT BUMPS CAN'T COLLAPSE INTO ONE OR REPEAT AN OLD VERSION
+    branches = {branch for branch in branches if branch} | {ALL_BRANCHES}
+
+    # ONLY AFTER COMMIT, SO A READER CAN'T CACHE PRE-COMMIT DATA UNDER THE NEW VERSION
+    transaction.on_commit(lambda: analytics_cache().set_many({version_key(branch): uuid4().hex for branch in branches}, None))
+
+
+def saved_branch(instance):
+    # THE BRANCH CURRENTLY STORED FOR instance, SO MOVING IT INVALIDATES THE BRANCH IT LEAVES
+    if instance._state.adding:
+        return None
+    return type(instance).objects.filter(pk=instance.pk).values_list('branch', flat=True).first()
+
+
+def normalize_params(query_params):
+    # SORTED KEYS AND VALUES, BLANK VALUES DROPPED SINCE THE VIEWS TREAT THEM AS MISSING
+    params = {key: sorted(value for value in values if value) for key, values in query_params.lists()}
+    return sorted((key, values) for key, values in params.items() if values)
+
+
+def cache_key(endpoint, query_params):
+    # TODAY IS PART OF THE KEY BECAUSE DEFAULT DATE RANGES ARE RELATIVE TO IT
+    versions = data_versions(query_params.get('branch'))
+    payload = json.dumps([normalize_params(query_params), versions, str(timezone.localdate())])
+    return f'analytics:response:{endpoint}:{hashlib.sha1(payload.encode()).hexdigest()}'
+
+
+def record(endpoint, kind):
+    cache = analytics_cache()
+    if not cache.add(metric_key(endpoint, kind), 1, None):
+        cache.incr(metric_key(endpoint, kind))
+
+
+def cache_metrics():
+    cache = analytics_cache()
+    counts = cache.get_many([metric_key(endpoint, kind) for endpoint in ENDPOINTS for kind in ('hits', 'misses')])
+
+    def stats(hits, misses):
+        return {'hits': hits, 'misses': misses, 'hitRate': round(hits / (hits + misses) * 100) if hits + misses else 0}
+
+    endpoints = [
+        {'endpoint': endpoint, **stats(counts.get(metric_key(endpoint, 'hits'), 0), counts.get(metric_key(endpoint, 'misses'), 0))}
+        for endpoint in ENDPOINTS
+    ]
+    return {
+        **stats(sum(entry['hits'] for entry in endpoints), sum(entry['misses'] for entry in endpoints)),
+        'endpoints': endpoints,
+    }
+
+
+def cached_analytics(endpoint):
+    # CACHE SUCCESSFUL GET RESPONSES PER (ENDPOINT, NORMALIZED PARAMS, DATA VERSION)
+    ENDPOINTS.append(endpoint)
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            key = cache_key(endpoint, request.query_params)
+            data = analytics_cache().get(key)
+
+            if data is not None:
+                record(endpoint, 'hits')
+                response = Response(data, status=status.HTTP_200_OK)
+                response['X-Analytics-Cache'] = 'HIT'
+                return response
+
+            record(endpoint, 'misses')
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                analytics_cache().set(key, response.data)
+            response['X-Analytics-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
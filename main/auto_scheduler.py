@@ -0,0 +1,404 @@
+import time as clock
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from django.db.models import F, Max
+from .models import Enrollment, Instructor, Vehicle, Classroom, Facility, Session
+from .availability import ACTIVE_STATUSES
+
+PENDING_STATUSES = ['Awaiting Action', 'Awaiting Follow-Up']
+
+# PDC SESSIONS RUN IN 2-HOUR BLOCKS AROUND LUNCH; A TDC SESSION TAKES THE WHOLE 7.5-HOUR DAY
+PDC_SLOTS = [(time(8), time(10)), (time(10), time(12)), (time(13), time(15)), (time(15), time(17))]
+TDC_SLOT = (time(8), time(15, 30))
+
+WHEEL_NUMS = {'4W': {'4W'}, '2W/3W': {'2W', '3W'}}
+SUNDAY = 6
+
+
+@dataclass
+class Resource:
+    code: str
+    branch: str
+    is_senior: bool = False
+    wheel_num: str = None
+    transmission_type: str = None
+    capacity: int = 0
+    facility_id: int = None
+
+
+@dataclass
+class PendingEnrollment:
+    enrollment_id: int
+    branch: str
+    category_type: str
+    category_code: str
+    transmission_type: str
+    next_nth: int
+    total_sessions: int
+    earliest_date: date
+    preferred_dates: set = field(default_factory=set)
+
+
+@dataclass
+class Proposal:
+    enrollment: PendingEnrollment
+    session_nth: int
+    session_date: date
+    start_time: time
+    end_time: time
+    instructor: Resource
+    facility: Resource
+
+
+@dataclass
+class TdcClass:
+    session_date: date
+    start_time: time
+    end_time: time
+    classroom: Resource
+    instructor_code: str
+    session_nth: int
+    seats_taken: int
+
+
+class Calendar:
+    # BOOKED INTERVALS PER (RESOURCE CODE, DATE); THE OWNER IS THE PROPOSAL, OR NONE FOR STORED SESSIONS
+    def __init__(self):
+        self.intervals = defaultdict(list)
+
+    def blockers(self, code, session_date, start_time, end_time):
+        return [
+            owner for booked_start, booked_end, owner in self.intervals[(code, session_date)]
+            if booked_start < end_time and booked_end > start_time
+        ]
+
+    def is_free(self, code, session_date, start_time, end_time):
+        return not self.blockers(code, session_date, start_time, end_time)
+
+    def book(self, code, session_date, start_time, end_time, owner=None):
+        self.intervals[(code, session_date)].append((start_time, end_time, owner))
+
+    def release(self, code, session_date, owner):
+        self.intervals[(code, session_date)] = [
+            interval for interval in self.intervals[(code, session_date)] if interval[2] is not owner
+        ]
+
+
+class AutoScheduler:
+    def __init__(self, enrollments, instructors, vehicles, classrooms, booked_sessions, start_date, end_date, time_budget=10.0):
+        self.enrollments = enrollments
+        self.instructors = instructors
+        self.instructors_by_code = {instructor.code: instructor for instructor in instructors}
+        self.vehicles = vehicles
+        self.classrooms = classrooms
+        self.days = [
+            start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)
+            if (start_date + timedelta(days=offset)).weekday() != SUNDAY
+        ]
+        self.time_budget = time_budget
+
+        self.instructor_calendar = Calendar()
+        self.facility_calendar = Calendar()
+        self.classes = defaultdict(list)
+        self.student_days = defaultdict(set)
+        self.load = defaultdict(int)
+        self.proposals = []
+
+        classrooms_by_code = {classroom.code: classroom for classroom in classrooms}
+        for session in booked_sessions:
+            self.instructor_calendar.book(session['instructor_id'], session['session_date'], session['start_time'], session['end_time'])
+            self.load[session['instructor_id']] += 1
+            if session['facility_code']:
+                self.facility_calendar.book(session['facility_code'], session['session_date'], session['start_time'], session['end_time'])
+                self.load[session['facility_code']] += 1
+
+            # STORED TDC CLASSES CAN TAKE MORE STUDENTS UP TO THE CLASSROOM'S CAPACITY
+            if session['facility_code'] in classrooms_by_code and session['session_nth'].isdigit():
+                self.join_stored_class(session, classrooms_by_code[session['facility_code']])
+
+    def join_stored_class(self, session, classroom):
+        for tdc_class in self.classes[session['session_date']]:
+            if (tdc_class.classroom is classroom and tdc_class.instructor_code == session['instructor_id']
+                    and tdc_class.start_time == session['start_time'] and tdc_class.session_nth == int(session['session_nth'])):
+                tdc_class.seats_taken += 1
+                return
+
+        self.classes[session['session_date']].append(TdcClass(
+            session['session_date'], session['start_time'], session['end_time'], classroom,
+            session['instructor_id'], int(session['session_nth']), 1
+        ))
+
+    def run(self):
+        deadline = clock.perf_counter() + self.time_budget
+        unscheduled = []
+
+        # GREEDY PASS: OLDEST ENROLLMENTS FIRST, EACH SESSION ON THE EARLIEST FEASIBLE (PREFERRED FIRST) DAY
+        for enrollment in sorted(self.enrollments, key=lambda enrollment: (enrollment.earliest_date, enrollment.enrollment_id)):
+            if clock.perf_counter() > deadline:
+                unscheduled.append((enrollment, enrollment.next_nth, "Time budget exhausted."))
+                continue
+
+            stuck = self.schedule_from(enrollment, enrollment.next_nth, enrollment.earliest_date)
+            if stuck:
+                unscheduled.append((enrollment, *stuck))
+
+        # REPAIR PASS: FREE A SLOT BY MOVING ANOTHER PROPOSAL WITHIN ITS OWN DAY, THEN CONTINUE GREEDILY
+        still_unscheduled = []
+        for enrollment, session_nth, reason in unscheduled:
+            if clock.perf_counter() > deadline or enrollment.category_type != 'PDC':
+                still_unscheduled.append((enrollment, session_nth, reason))
+                continue
+
+            proposal = self.repair(enrollment, session_nth, self.next_date(enrollment), deadline)
+            if proposal is None:
+                still_unscheduled.append((enrollment, session_nth, reason))
+                continue
+
+            stuck = self.schedule_from(enrollment, session_nth + 1, proposal.session_date + timedelta(days=1))
+            if stuck:
+                still_unscheduled.append((enrollment, *stuck))
+
+        return self.proposals, [
+            {'enrollmentId': enrollment.enrollment_id, 'sessionNth': session_nth, 'reason': reason}
+            for enrollment, session_nth, reason in still_unscheduled
+        ]
+
+    def next_date(self, enrollment):
+        proposed = [proposal.session_date for proposal in self.proposals if proposal.enrollment is enrollment]
+        return max(proposed) + timedelta(days=1) if proposed else enrollment.earliest_date
+
+    def schedule_from(self, enrollment, session_nth, earliest_date):
+        for nth in range(session_nth, enrollment.total_sessions + 1):
+            proposal = self.place(enrollment, nth, earliest_date)
+            if proposal is None:
+                return nth, "No free instructor and facility in the horizon."
+            earliest_date = proposal.session_date + timedelta(days=1)
+        return None
+
+    def candidate_days(self, enrollment, earliest_date):
+        days = [day for day in self.days if day >= earliest_date and day not in self.student_days[enrollment.enrollment_id]]
+        return sorted(days, key=lambda day: (day not in enrollment.preferred_dates, day))
+
+    def place(self, enrollment, session_nth, earliest_date):
+        for day in self.candidate_days(enrollment, earliest_date):
+            if enrollment.category_type == 'PDC':
+                proposal = self.place_pdc(enrollment, session_nth, day)
+            else:
+                proposal = self.place_tdc(enrollment, session_nth, day)
+            if proposal is not None:
+                return proposal
+        return None
+
+    def branch_rank(self, resource, enrollment):
+        return 0 if resource.branch == enrollment.branch else 1
+
+    def eligible(self, resources, enrollment):
+        # BRANCH FIRST WITH MAIN AS THE FALLBACK
+        return [resource for resource in resources if resource.branch in (enrollment.branch, 'Main')]
+
+    def ranked_instructors(self, enrollment, session_nth):
+        senior_first = enrollment.category_type == 'PDC' and session_nth in (1, enrollment.total_sessions)
+        return sorted(self.eligible(self.instructors, enrollment), key=lambda instructor: (
+            self.branch_rank(instructor, enrollment),
+            senior_first and not instructor.is_senior,
+            self.load[instructor.code],
+            instructor.code,
+        ))
+
+    def ranked_vehicles(self, enrollment):
+        wheel_nums = WHEEL_NUMS.get(enrollment.category_code, {enrollment.category_code})
+        matching = [
+            vehicle for vehicle in self.eligible(self.vehicles, enrollment)
+            if vehicle.wheel_num in wheel_nums and enrollment.transmission_type in (vehicle.transmission_type, 'NA')
+        ]
+        return sorted(matching, key=lambda vehicle: (self.branch_rank(vehicle, enrollment), self.load[vehicle.code], vehicle.code))
+
+    def place_pdc(self, enrollment, session_nth, day, slots=PDC_SLOTS):
+        instructors = self.ranked_instructors(enrollment, session_nth)
+        vehicles = self.ranked_vehicles(enrollment)
+
+        for start_time, end_time in slots:
+            instructor = next((instructor for instructor in instructors if self.instructor_calendar.is_free(instructor.code, day, start_time, end_time)), None)
+            vehicle = next((vehicle for vehicle in vehicles if self.facility_calendar.is_free(vehicle.code, day, start_time, end_time)), None)
+            if instructor and vehicle:
+                return self.propose(enrollment, session_nth, day, start_time, end_time, instructor, vehicle)
+        return None
+
+    def place_tdc(self, enrollment, session_nth, day):
+        start_time, end_time = TDC_SLOT
+
+        # JOIN AN OPEN CLASS FOR THE SAME SESSION, FULLEST FIRST SO CLASSES CONSOLIDATE
+        open_classes = [
+            tdc_class for tdc_class in self.classes[day]
+            if tdc_class.session_nth == session_nth and tdc_class.seats_taken < tdc_class.classroom.capacity
+            and tdc_class.classroom.branch in (enrollment.branch, 'Main') and tdc_class.instructor_code in self.instructors_by_code
+        ]
+        if open_classes:
+            tdc_class = min(open_classes, key=lambda tdc_class: (self.branch_rank(tdc_class.classroom, enrollment), -tdc_class.seats_taken))
+            tdc_class.seats_taken += 1
+            instructor = self.instructors_by_code[tdc_class.instructor_code]
+            return self.propose(enrollment, session_nth, day, tdc_class.start_time, tdc_class.end_time, instructor, tdc_class.classroom, book=False)
+
+        # OTHERWISE OPEN A NEW CLASS IN A FREE CLASSROOM WITH A FREE INSTRUCTOR
+        classrooms = sorted(
+            (classroom for classroom in self.eligible(self.classrooms, enrollment) if classroom.capacity > 0),
+            key=lambda classroom: (self.branch_rank(classroom, enrollment), self.load[classroom.code], classroom.code)
+        )
+        classroom = next((classroom for classroom in classrooms if self.facility_calendar.is_free(classroom.code, day, start_time, end_time)), None)
+        instructor = next((
+            instructor for instructor in self.ranked_instructors(enrollment, session_nth)
+            if self.instructor_calendar.is_free(instructor.code, day, start_time, end_time)
+        ), None)
+        if not (classroom and instructor):
+            return None
+
+        self.classes[day].append(TdcClass(day, start_time, end_time, classroom, instructor.code, session_nth, 1))
+        return self.propose(enrollment, session_nth, day, start_time, end_time, instructor, classroom)
+
+    def propose(self, enrollment, session_nth, day, start_time, end_time, instructor, facility, book=True):
+        proposal = Proposal(enrollment, session_nth, day, start_time, end_time, instructor, facility)
+        if book:
+            self.instructor_calendar.book(instructor.code, day, start_time, end_time, proposal)
+            self.facility_calendar.book(facility.code, day, start_time, end_time, proposal)
+        self.load[instructor.code] += 1
+        self.load[facility.code] += 1
+        self.student_days[enrollment.enrollment_id].add(day)
+        self.proposals.append(proposal)
+        return proposal
+
+    def withdraw(self, proposal):
+        self.instructor_calendar.release(proposal.instructor.code, proposal.session_date, proposal)
+        self.facility_calendar.release(proposal.facility.code, proposal.session_date, proposal)
+        self.load[proposal.instructor.code] -= 1
+        self.load[proposal.facility.code] -= 1
+        self.student_days[proposal.enrollment.enrollment_id].discard(proposal.session_date)
+        self.proposals.remove(proposal)
+
+    def restore(self, proposal):
+        self.propose(proposal.enrollment, proposal.session_nth, proposal.session_date, proposal.start_time, proposal.end_time, proposal.instructor, proposal.facility)
+
+    def movable_blockers(self, calendar, resources, day, start_time, end_time):
+        # THE FIRST RESOURCE THAT IS FREE, OR HELD ONLY BY PROPOSED PDC SESSIONS THAT COULD MOVE
+        for resource in resources:
+            owners = calendar.blockers(resource.code, day, start_time, end_time)
+            if all(owner is not None and owner.enrollment.category_type == 'PDC' for owner in owners):
+                return owners
+        return None
+
+    def repair(self, enrollment, session_nth, earliest_date, deadline):
+        instructors = self.ranked_instructors(enrollment, session_nth)
+        vehicles = self.ranked_vehicles(enrollment)
+
+        for day in self.candidate_days(enrollment, earliest_date):
+            for start_time, end_time in PDC_SLOTS:
+                if clock.perf_counter() > deadline:
+                    return None
+
+                instructor_blockers = self.movable_blockers(self.instructor_calendar, instructors, day, start_time, end_time)
+                vehicle_blockers = self.movable_blockers(self.facility_calendar, vehicles, day, start_time, end_time)
+                if instructor_blockers is None or vehicle_blockers is None:
+                    continue
+
+                # MOVE THE BLOCKING PROPOSALS TO OTHER SLOTS OF THE SAME DAY, WHICH KEEPS THEIR SESSION ORDER
+                blockers = list({id(blocker): blocker for blocker in instructor_blockers + vehicle_blockers}.values())
+                for blocker in blockers:
+                    self.withdraw(blocker)
+
+                proposal = self.place_pdc(enrollment, session_nth, day, slots=[(start_time, end_time)])
+                moved = []
+                if proposal is not None:
+                    for blocker in blockers:
+                        other_slots = [slot for slot in PDC_SLOTS if slot != (blocker.start_time, blocker.end_time)]
+                        replacement = self.place_pdc(blocker.enrollment, blocker.session_nth, day, slots=other_slots)
+                        if replacement is None:
+                            break
+                        moved.append(replacement)
+                    else:
+                        return proposal
+
+                # UNDO THE ATTEMPT
+                for replacement in moved + ([proposal] if proposal else []):
+                    self.withdraw(replacement)
+                for blocker in blockers:
+                    self.restore(blocker)
+        return None
+
+
+def load_scheduler(branch, start_date, end_date, time_budget=10.0):
+    # PENDING ENROLLMENTS OF THE BRANCH WITH SESSIONS LEFT TO SCHEDULE
+    enrollments = []
+    pending = Enrollment.objects.filter(branch=branch, status__in=PENDING_STATUSES).select_related(
+        'course__course_category'
+    ).annotate(last_session_date=Max('session__session_date'))
+    for enrollment in pending:
+        next_nth = enrollment.scheduled_count + enrollment.completed_count + 1
+        total_sessions = enrollment.get_total_sessions()
+        if next_nth > total_sessions:
+            continue
+
+        earliest_date = start_date
+        if enrollment.last_session_date and enrollment.last_session_date >= start_date:
+            earliest_date = enrollment.last_session_date + timedelta(days=1)
+
+        enrollments.append(PendingEnrollment(
+            enrollment_id=enrollment.pk,
+            branch=enrollment.branch_id,
+            category_type=enrollment.course.course_category.category_type,
+            category_code=enrollment.course.course_category.category_code,
+            transmission_type=enrollment.transmission_type,
+            next_nth=next_nth,
+            total_sessions=total_sessions,
+            earliest_date=earliest_date,
+            preferred_dates=set(enrollment.preferred_dates),
+        ))
+
+    # ACTIVE RESOURCES OF THE BRANCH AND MAIN; A VEHICLE OR CLASSROOM WITHOUT A FACILITY ROW CAN'T BE BOOKED
+    branches = [branch, 'Main']
+    facility_ids = dict(Facility.objects.values_list('object_id', 'id'))
+    instructors = [
+        Resource(code=code, branch=branch_name, is_senior=is_senior)
+        for code, branch_name, is_senior in Instructor.objects.filter(branch__in=branches).exclude(
+            status__in=['Archived', 'Inactive', 'On Leave']
+        ).values_list('instructor_code', 'branch_id', 'is_senior')
+    ]
+    vehicles = [
+        Resource(code=code, branch=branch_name, wheel_num=wheel_num, transmission_type=transmission_type, facility_id=facility_ids.get(code))
+        for code, branch_name, wheel_num, transmission_type in Vehicle.objects.filter(branch__in=branches).exclude(
+            status__in=['Archived', 'Unavailable']
+        ).values_list('vehicle_code', 'branch_id', 'wheel_num', 'transmission_type')
+        if code in facility_ids
+    ]
+    classrooms = [
+        Resource(code=code, branch=branch_name, capacity=capacity, facility_id=facility_ids.get(code))
+        for code, branch_name, capacity in Classroom.objects.filter(branch__in=branches).exclude(
+            status__in=['Archived', 'Unavailable']
+        ).values_list('classroom_code', 'branch_id', 'capacity')
+        if code in facility_ids
+    ]
+
+    # SESSIONS ALREADY HOLDING RESOURCES IN THE HORIZON
+    booked_sessions = Session.objects.filter(
+        session_date__range=[start_date, end_date], status__in=ACTIVE_STATUSES
+    ).values('session_date', 'start_time', 'end_time', 'instructor_id', 'session_nth', facility_code=F('facility__object_id'))
+
+    return AutoScheduler(enrollments, instructors, vehicles, classrooms, booked_sessions, start_date, end_date, time_budget)
+
+
+def save_proposals(proposals):
+    # ONE QUERY FOR THE FACILITIES, WHICH bulk_schedule READS FOR THEIR TYPE AND CODE
+    facilities = Facility.objects.in_bulk({proposal.facility.facility_id for proposal in proposals})
+    sessions = [
+        Session(
+            session_nth=str(proposal.session_nth),
+            session_date=proposal.session_date,
+            start_time=proposal.start_time,
+            end_time=proposal.end_time,
+            enrollment_id=proposal.enrollment.enrollment_id,
+            instructor_id=proposal.instructor.code,
+            facility=facilities[proposal.facility.facility_id],
+            status='Scheduled',
+        )
+        for proposal in proposals
+    ]
+    return Session.bulk_schedule(sessions)
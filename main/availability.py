@@ -0,0 +1,136 @@
+from datetime import datetime
+from django.db.models import F, Sum
+from .models import Session, TdcOffering
+
+ACTIVE_STATUSES = ['Scheduled', 'Completed']
+
+
+def parse_time_window(date, start_time, end_time=None):
+    start_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
+    end_datetime = datetime.strptime(f"{date} {end_time or '23:59'}", "%Y-%m-%d %H:%M")
+    return start_datetime.date(), start_datetime.time(), end_datetime.time()
+
+
+def parse_window_params(query_params):
+    # (session_date, start_time, end_time) FROM date/start_time/end_time QUERY PARAMS, OR NONE IF ABSENT OR INVALID
+    date = query_params.get('date', None)
+    start_time = query_params.get('start_time', None)
+    end_time = query_params.get('end_time', None)
+
+    if not (date and start_time):
+        return None
+    try:
+        return parse_time_window(date, start_time, end_time)
+    except ValueError:
+        return None
+
+
+def overlapping_sessions(session_date, start_time, end_time):
+    # SESSIONS HOLDING A RESOURCE ANYWHERE IN [start_time, end_time) ON session_date
+    return Session.objects.filter(
+        session_date=session_date,
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+        status__in=ACTIVE_STATUSES
+    )
+
+
+def overlapping_offerings(session_date, start_time, end_time):
+    # TDC CLASSES HOLDING CLASSROOM SEATS ANYWHERE IN [start_time, end_time) ON session_date
+    return TdcOffering.objects.filter(
+        session_date=session_date,
+        start_time__lt=end_time,
+        end_time__gt=start_time
+    )
+
+
+def classroom_occupancy(session_date, start_time, end_time):
+    # SEATS TAKEN PER CLASSROOM BY CLASSES OVERLAPPING THE WINDOW, NEXT TO THE CLASSROOM'S CAPACITY
+    return overlapping_offerings(session_date, start_time, end_time).values(
+        'classroom', capacity=F('classroom__capacity')
+    ).annotate(
+        occupied=Sum('seats_taken')
+    )
+
+
+def get_busy_instructors(session_date, start_time, end_time):
+    return set(
+        overlapping_sessions(session_date, start_time, end_time)
+        .values_list('instructor_id', flat=True)
+    )
+
+
+def get_busy_facilities(session_date, start_time, end_time, facility_type):
+    return set(
+        overlapping_sessions(session_date, start_time, end_time)
+        .filter(facility__facility_type=facility_type)
+        .values_list('facility__object_id', flat=True)
+    )
+
+
+def get_booked_sessions(session_dates):
+    # ACTIVE SESSIONS ON THE GIVEN DATES, GROUPED BY DATE, FOR CHECKING MANY WINDOWS IN MEMORY
+    booked = {}
+    sessions = Session.objects.filter(session_date__in=session_dates, status__in=ACTIVE_STATUSES).values(
+        'session_date', 'start_time', 'end_time', 'instructor_id', 'facility_type', 'facility__object_id'
+    )
+    for session in sessions:
+        booked.setdefault(session['session_date'], []).append(session)
+    return booked
+
+
+def get_busy_resources(booked_sessions, start_time, end_time):
+    # INSTRUCTORS AND FACILITIES (KEYED BY FACILITY TYPE) HOLDING ANY PART OF [start_time, end_time)
+    busy_instructors = set()
+    busy_facilities = {}
+    for session in booked_sessions:
+        if session['start_time'] < end_time and session['end_time'] > start_time:
+            busy_instructors.add(session['instructor_id'])
+            busy_facilities.setdefault(session['facility_type'], set()).add(session['facility__object_id'])
+    return busy_instructors, busy_facilities
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def free_intervals(busy_intervals, day_start, day_end):
+    # SWEEP THE SORTED BUSY INTERVALS, EMITTING THE GAPS INSIDE [day_start, day_end)
+    free = []
+    cursor = day_start
+    for start, end in sorted(busy_intervals):
+        if start > cursor:
+            free.append((cursor, min(start, day_end)))
+        cursor = max(cursor, end)
+        if cursor >= day_end:
+            break
+    if cursor < day_end:
+        free.append((cursor, day_end))
+    return [(start, end) for start, end in free if end > start]
+
+
+def union_intervals(intervals):
+    # MERGE CLOSED INTERVALS THAT TOUCH OR OVERLAP
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect_intervals(left, right):
+    # TWO-POINTER SWEEP OVER TWO SORTED, MERGED LISTS OF CLOSED INTERVALS
+    intersection = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start <= end:
+            intersection.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return intersection
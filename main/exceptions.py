@@ -0,0 +1,19 @@
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler as drf_exception_handler
+from .models.session import INSTRUCTOR_OVERLAP_CONSTRAINT, VEHICLE_OVERLAP_CONSTRAINT
+
+SCHEDULING_CONFLICTS = {
+    INSTRUCTOR_OVERLAP_CONSTRAINT: 'The instructor already has a session at this time.',
+    VEHICLE_OVERLAP_CONSTRAINT: 'The vehicle is already booked at this time.',
+}
+
+def exception_handler(exc, context):
+    # Double bookings are rejected by the session exclusion constraints; report them as conflicts.
+    if isinstance(exc, IntegrityError):
+        constraint = getattr(getattr(exc.__cause__, 'diag', None), 'constraint_name', None)
+        if constraint in SCHEDULING_CONFLICTS:
+            return Response({'error': SCHEDULING_CONFLICTS[constraint]}, status=status.HTTP_409_CONFLICT)
+
+    return drf_exception_handler(exc, context)
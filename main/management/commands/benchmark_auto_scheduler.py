@@ -0,0 +1,134 @@
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from ...auto_scheduler import AutoScheduler, Resource, PendingEnrollment
+
+
+def synthetic_branch(branch, enrollments, start_date, seed=0):
+    rng = random.Random(f"{branch}-{seed}")
+    prefix = ''.join(char for char in branch if char.isalnum()).upper()
+
+    # ABOUT ONE INSTRUCTOR PER 12 ENROLLMENTS AND ONE VEHICLE PER 15, A QUARTER OF INSTRUCTORS SENIOR
+    instructors = [
+        Resource(code=f"{prefix}-INS-{index:03}", branch=branch, is_senior=index % 4 == 0)
+        for index in range(max(enrollments // 12, 2))
+    ]
+    vehicles = [
+        Resource(code=f"{prefix}-VEH-{index:03}", branch=branch, facility_id=index,
+                 wheel_num='4W' if index % 4 else rng.choice(['2W', '3W']),
+                 transmission_type='AT' if index % 2 else 'MT')
+        for index in range(max(enrollments // 15, 2))
+    ]
+    classrooms = [
+        Resource(code=f"{prefix}-RM-{index:02}", branch=branch, capacity=rng.choice([15, 20, 25]), facility_id=index)
+        for index in range(max(enrollments // 150, 1))
+    ]
+
+    pending = []
+    for index in range(enrollments):
+        is_tdc = rng.random() < 0.3
+        earliest_date = start_date + timedelta(days=rng.randint(0, 6))
+        pending.append(PendingEnrollment(
+            enrollment_id=f"{prefix}-{index}",
+            branch=branch,
+            category_type='TDC' if is_tdc else 'PDC',
+            category_code='TDC' if is_tdc else rng.choice(['4W', '4W', '4W', '2W/3W']),
+            transmission_type='NA' if is_tdc else rng.choice(['AT', 'MT']),
+            next_nth=1,
+            total_sessions=2 if is_tdc else rng.choice([2, 4, 5, 8]),
+            earliest_date=earliest_date,
+            preferred_dates={earliest_date + timedelta(days=rng.randint(0, 10)) for _ in range(rng.randint(0, 3))},
+        ))
+
+    return pending, instructors, vehicles, classrooms
+
+
+def find_violations(proposals):
+    violations = []
+    by_instructor = defaultdict(list)
+    by_vehicle = defaultdict(list)
+    seats = defaultdict(int)
+    by_enrollment = defaultdict(list)
+
+    for proposal in proposals:
+        by_instructor[(proposal.instructor.code, proposal.session_date)].append(proposal)
+        by_enrollment[proposal.enrollment.enrollment_id].append(proposal)
+        if proposal.enrollment.category_type == 'PDC':
+            by_vehicle[(proposal.facility.code, proposal.session_date)].append(proposal)
+        else:
+            seats[(proposal.facility.code, proposal.session_date, proposal.start_time)] += 1
+            if seats[(proposal.facility.code, proposal.session_date, proposal.start_time)] > proposal.facility.capacity:
+                violations.append(f"{proposal.facility.code} over capacity on {proposal.session_date}")
+
+    # INSTRUCTORS MAY ONLY OVERLAP WHEN TEACHING THE SAME CLASSROOM SLOT
+    for bookings in [*by_instructor.values(), *by_vehicle.values()]:
+        bookings.sort(key=lambda proposal: proposal.start_time)
+        for previous, current in zip(bookings, bookings[1:]):
+            same_class = previous.facility is current.facility and previous.start_time == current.start_time and current.enrollment.category_type == 'TDC'
+            if current.start_time < previous.end_time and not same_class:
+                violations.append(f"{current.instructor.code}/{current.facility.code} double booked on {current.session_date}")
+
+    for enrollment_id, sessions in by_enrollment.items():
+        sessions.sort(key=lambda proposal: proposal.session_nth)
+        if any(current.session_date <= previous.session_date for previous, current in zip(sessions, sessions[1:])):
+            violations.append(f"Enrollment {enrollment_id} sessions out of order")
+
+    return violations
+
+
+class Command(BaseCommand):
+    help = "Runs the auto-scheduler on synthetic branches and checks the timetable is conflict-free."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branches', type=int, default=3, help="Synthetic branches besides Main.")
+        parser.add_argument('--enrollments', type=int, nargs='+', default=[100, 300, 600], help="Pending enrollments per branch.")
+        parser.add_argument('--days', type=int, default=28, help="Scheduling horizon in days.")
+        parser.add_argument('--time-budget', type=float, default=10.0, help="Seconds allowed per branch run.")
+
+    def handle(self, *args, **options):
+        start_date = date(2024, 7, 1)
+        end_date = start_date + timedelta(days=options['days'] - 1)
+
+        for size in options['enrollments']:
+            main = synthetic_branch('Main', size, start_date)
+            booked_sessions = []
+            elapsed = 0.0
+            requested = 0
+            all_proposals = []
+
+            # ONE RUN PER BRANCH LIKE THE ENDPOINT, EACH SEEING WHAT EARLIER RUNS BOOKED
+            for branch in ['Main'] + [f"Branch {index}" for index in range(1, options['branches'] + 1)]:
+                pending, instructors, vehicles, classrooms = main if branch == 'Main' else synthetic_branch(branch, size, start_date)
+                if branch != 'Main':
+                    instructors, vehicles, classrooms = instructors + main[1], vehicles + main[2], classrooms + main[3]
+
+                scheduler = AutoScheduler(pending, instructors, vehicles, classrooms, booked_sessions, start_date, end_date, options['time_budget'])
+                started = time.perf_counter()
+                proposals, _ = scheduler.run()
+                elapsed += time.perf_counter() - started
+
+                requested += sum(enrollment.total_sessions for enrollment in pending)
+                all_proposals += proposals
+                booked_sessions += [
+                    {
+                        'session_date': proposal.session_date,
+                        'start_time': proposal.start_time,
+                        'end_time': proposal.end_time,
+                        'instructor_id': proposal.instructor.code,
+                        'facility_code': proposal.facility.code,
+                        'session_nth': str(proposal.session_nth),
+                    }
+                    for proposal in proposals
+                ]
+
+            # MAIN'S RESOURCES ARE SHARED BY EVERY BRANCH, SO CHECK ALL RUNS TOGETHER
+            violations = find_violations(all_proposals)
+            self.stdout.write(
+                f"{size:>5} enrollments/branch  {elapsed:7.3f}s  placed {len(all_proposals)}/{requested} sessions"
+                f"  {'conflict-free' if not violations else f'{len(violations)} VIOLATIONS'}"
+            )
+            for violation in violations[:10]:
+                self.stdout.write(f"    {violation}")
+
@@ -0,0 +1,111 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from ...views.analytics.recommendation.resource_catalog import InstructorRecord, VehicleRecord
+from ...views.analytics.recommendation.instructor_recommendation import rank_instructors
+from ...views.analytics.recommendation.vehicle_recommendation import rank_vehicles
+
+
+def legacy_rank_instructors(available_instructors, category, branch, session_nth, last_session):
+    # THE LIST-MEMBERSHIP AND DISPLAY-NAME MATCHING rank_instructors USED BEFORE THE RECORD INDEX
+    senior_instructors = []
+    remaining_instructors = []
+    recommended_instructors = []
+    for instructor in available_instructors:
+        instructor_info = {
+            'instructorCode': instructor['instructorCode'],
+            'instructorName': instructor['instructorName'],
+            'branchName': instructor['instructorName'].split(" / ")[-1]
+        }
+        recommended_instructors.append(instructor_info)
+        if "SR" in instructor['instructorName']:
+            senior_instructors.append(instructor_info)
+        else:
+            remaining_instructors.append(instructor_info)
+
+    if (category == 'PDC') and (session_nth == 1 or session_nth == last_session):
+        recommended_instructors = senior_instructors + remaining_instructors
+
+    branch_instructors = [instructor for instructor in recommended_instructors if instructor['branchName'] == branch]
+    if not branch_instructors:
+        branch_instructors = [instructor for instructor in recommended_instructors if instructor['branchName'] == 'Main']
+
+    other_instructors = [instructor for instructor in recommended_instructors if instructor not in branch_instructors]
+    return branch_instructors + other_instructors
+
+
+def legacy_rank_vehicles(available_vehicles, wheel_num, transmission_type, branch):
+    filtered_vehicles = [
+        vehicle for vehicle in available_vehicles
+        if vehicle['wheelNum'] == wheel_num and vehicle['transmissionType'] == transmission_type
+    ]
+    branch_vehicles = [vehicle for vehicle in filtered_vehicles if branch in vehicle['vehicleName']]
+    if not branch_vehicles:
+        branch_vehicles = [vehicle for vehicle in filtered_vehicles if "Main" in vehicle['vehicleName']]
+    other_vehicles = [
+        vehicle for vehicle in filtered_vehicles
+        if vehicle['vehicleCode'] not in [v['vehicleCode'] for v in branch_vehicles]
+    ]
+    return branch_vehicles + other_vehicles
+
+
+def synthetic_records(size, seed=0):
+    rng = random.Random(seed)
+    # A FEW LARGE BRANCHES, TWO OF WHICH HAVE NAMES THAT ARE SUBSTRINGS OF EACH OTHER
+    branches = ['Main', 'North', 'Northgate', 'South']
+
+    instructors = []
+    vehicles = []
+    for index in range(size):
+        branch = rng.choice(branches)
+        is_senior = rng.random() < 0.25
+        instructors.append(InstructorRecord(
+            code=f"INS-{index:06}", name=f"Name{index}{' SR' if is_senior else ''} / {branch}",
+            branch=branch, is_senior=is_senior, hours_assigned=float(rng.randint(0, 40)),
+        ))
+        vehicles.append(VehicleRecord(
+            code=f"VEH-{index:06}", name=f"Model AT White / {branch}", branch=branch, facility_id=index,
+            wheel_num='4W', transmission_type='AT', hours_assigned=float(rng.randint(0, 40)),
+        ))
+
+    instructors.sort(key=lambda record: (record.hours_assigned, record.code))
+    vehicles.sort(key=lambda record: (record.hours_assigned, record.code))
+    return instructors, vehicles, 'North'
+
+
+class Command(BaseCommand):
+    help = "Times recommendation ranking against resource count to show it scales linearly."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help="Resource counts to benchmark.")
+        parser.add_argument('--skip-legacy-above', type=int, default=10_000, help="Only time the legacy ranking up to this many resources.")
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            instructors, vehicles, branch = synthetic_records(size)
+
+            started = time.perf_counter()
+            ranked_instructors = rank_instructors(instructors, 'PDC', branch, 1, 8)
+            ranked_vehicles = rank_vehicles(vehicles, '4W', 'AT', branch)
+            elapsed = time.perf_counter() - started
+
+            line = f"{size:>8} resources  indexed {elapsed:8.3f}s  ({elapsed / size * 1e6:6.2f}us/resource)"
+
+            if options['skip_legacy_above'] is None or size <= options['skip_legacy_above']:
+                instructor_dicts = [{**record.to_response(), 'instructorName': record.name} for record in instructors]
+                vehicle_dicts = [
+                    {**record.to_response(), 'wheelNum': record.wheel_num, 'transmissionType': record.transmission_type}
+                    for record in vehicles
+                ]
+
+                started = time.perf_counter()
+                legacy_instructors = legacy_rank_instructors(instructor_dicts, 'PDC', branch, 1, 8)
+                legacy_vehicles = legacy_rank_vehicles(vehicle_dicts, '4W', 'AT', branch)
+                legacy = time.perf_counter() - started
+
+                # THE LEGACY SUBSTRING MATCH ALSO COUNTS Northgate VEHICLES AS North, SO THEIR ORDER IS EXPECTED TO DIFFER
+                matches = [instructor['instructorCode'] for instructor in ranked_instructors] == [instructor['instructorCode'] for instructor in legacy_instructors]
+                line += f"  legacy {legacy:8.3f}s  speedup {legacy / elapsed:7.1f}x  instructors {'match' if matches else 'MISMATCH'}"
+                line += f"  vehicle order {'same' if [vehicle['vehicleCode'] for vehicle in ranked_vehicles] == [vehicle['vehicleCode'] for vehicle in legacy_vehicles] else 'differs (substring branch match)'}"
+
+            self.stdout.write(line)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...models import Enrollment
+from ...analytics_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = "Recounts the per-enrollment session counters from the sessions table and reports any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without rewriting the counters.")
+
+    def handle(self, *args, **options):
+        counters = Enrollment.SESSION_COUNTER_FIELDS
+        enrollments = Enrollment.objects.select_related('course__course_category').with_actual_session_counts()
+
+        drifted = []
+        for enrollment in enrollments.iterator(chunk_size=2000):
+            drift = {
+                field: (getattr(enrollment, field), getattr(enrollment, f'actual_{field}'))
+                for field in counters.values()
+                if getattr(enrollment, field) != getattr(enrollment, f'actual_{field}')
+            }
+            if not drift:
+                continue
+
+            self.stdout.write(f"Enrollment {enrollment.pk}: " + ", ".join(
+                f"{field} {stored} -> {actual}" for field, (stored, actual) in drift.items()
+            ))
+            for field, (_, actual) in drift.items():
+                setattr(enrollment, field, actual)
+            drifted.append(enrollment)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("No counter drift found."))
+            return
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} enrollment(s) have drifted counters."))
+            return
+
+        with transaction.atomic():
+            for enrollment in drifted:
+                enrollment.status = enrollment.resolve_status()
+            Enrollment.objects.bulk_update(drifted, [*counters.values(), 'status'], batch_size=500)
+            bump_data_version({enrollment.branch_id for enrollment in drifted})
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {len(drifted)} enrollment(s)."))
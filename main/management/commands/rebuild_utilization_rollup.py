@@ -0,0 +1,26 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Branch, Session, UtilizationRollup
+from ...analytics_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily utilization rollup from the sessions table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dates', nargs='*', help="Only rebuild these dates (yyyy-mm-dd). Rebuilds every date when omitted.")
+
+    def handle(self, *args, **options):
+        try:
+            dates = [datetime.strptime(date, '%Y-%m-%d').date() for date in options['dates']] or None
+        except ValueError:
+            raise CommandError("Invalid date format. Please use yyyy-mm-dd.")
+
+        rows = UtilizationRollup.refresh(dates)
+
+        # CACHED ANALYTICS STILL HOLD THE PRE-REPAIR NUMBERS FOR EVERY BRANCH THAT HAD SESSIONS ON THE REBUILT DATES
+        if dates is None:
+            bump_data_version(Branch.objects.values_list('pk', flat=True))
+        else:
+            bump_data_version(Session.objects.filter(session_date__in=dates).values_list('enrollment__branch', flat=True).distinct())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} utilization rollup row(s)."))
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:54
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_session_counters(apps, schema_editor):
+    Enrollment = apps.get_model('main', 'Enrollment')
+    Session = apps.get_model('main', 'Session')
+
+    counters = {
+        'scheduled_count': 'Scheduled',
+        'completed_count': 'Completed',
+        'missed_count': 'Missed',
+        'cancelled_count': 'Cancelled',
+    }
+    Enrollment.objects.update(**{
+        field: Coalesce(Subquery(
+            Session.objects.filter(enrollment=OuterRef('pk'), status=status)
+            .values('enrollment').annotate(count=Count('pk')).values('count'),
+            output_field=IntegerField()
+        ), Value(0))
+        for field, status in counters.items()
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0022_student_address_student_contact_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='cancelled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='missed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='scheduled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_session_counters, migrations.RunPython.noop),
+    ]
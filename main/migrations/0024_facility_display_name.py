@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+def populate_display_names(apps, schema_editor):
+    Facility = apps.get_model('main', 'Facility')
+    Vehicle = apps.get_model('main', 'Vehicle')
+    Classroom = apps.get_model('main', 'Classroom')
+
+    vehicles = {
+        vehicle.vehicle_code: f"{vehicle.vehicle_model} {vehicle.transmission_type} {vehicle.color} / {vehicle.branch_id}"
+        for vehicle in Vehicle.objects.all()
+    }
+    classrooms = {
+        classroom.classroom_code: f"{classroom.classroom_code} / {classroom.branch_id}"
+        for classroom in Classroom.objects.all()
+    }
+
+    facilities = list(Facility.objects.all())
+    for facility in facilities:
+        names = vehicles if facility.facility_type == 'Vehicle' else classrooms
+        facility.display_name = names.get(facility.object_id, '')
+    Facility.objects.bulk_update(facilities, ['display_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0023_enrollment_session_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facility',
+            name='display_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(populate_display_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0024_facility_display_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['session_date', 'start_time', 'end_time'], name='session_time_span_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['instructor', 'session_date', 'start_time', 'end_time'], name='session_instructor_span_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['facility', 'session_date', 'start_time', 'end_time'], name='session_facility_span_idx'),
+        ),
+    ]
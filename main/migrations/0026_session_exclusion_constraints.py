@@ -0,0 +1,86 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:00
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_facility_types(apps, schema_editor):
+    Session = apps.get_model('main', 'Session')
+    Facility = apps.get_model('main', 'Facility')
+
+    Session.objects.filter(facility__isnull=False).update(
+        facility_type=Subquery(Facility.objects.filter(pk=OuterRef('facility_id')).values('facility_type')[:1])
+    )
+
+
+def check_time_ranges(apps, schema_editor):
+    Session = apps.get_model('main', 'Session')
+
+    # tstzrange REJECTS AN END BEFORE THE START, AND AN EMPTY RANGE WOULD NEVER OVERLAP ANYTHING
+    invalid = Session.objects.filter(end_time__lte=F('start_time')).order_by('session_id').values_list('session_id', flat=True)
+
+    if invalid:
+        raise RuntimeError(
+            'Cannot add the session time span while sessions end at or before their start time. '
+            f'Fix the times of these sessions first: {", ".join(map(str, invalid))}.'
+        )
+
+
+def check_double_bookings(apps, schema_editor):
+    Session = apps.get_model('main', 'Session')
+
+    active = Session.objects.filter(status__in=['Scheduled', 'Completed'])
+    overlapping = active.filter(
+        session_date=OuterRef('session_date'),
+        start_time__lt=OuterRef('end_time'),
+        end_time__gt=OuterRef('start_time'),
+    ).exclude(session_id=OuterRef('session_id'))
+
+    double_booked = active.annotate(facility_key=Coalesce('facility_id', -F('session_id'))).filter(
+        Exists(overlapping.annotate(facility_key=Coalesce('facility_id', -F('session_id'))).filter(instructor_id=OuterRef('instructor_id')).exclude(facility_key=OuterRef('facility_key'))) |
+        Q(facility_type='Vehicle') & Exists(overlapping.filter(facility_id=OuterRef('facility_id'), facility_type='Vehicle'))
+    ).order_by('session_id').values_list('session_id', flat=True)
+
+    if double_booked:
+        raise RuntimeError(
+            'Cannot add the session exclusion constraints while instructors or vehicles are double booked. '
+            f'Reschedule or cancel these sessions first: {", ".join(map(str, double_booked))}.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0025_session_time_span_indexes'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(check_time_ranges, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='session',
+            name='facility_type',
+            field=models.CharField(blank=True, choices=[('Vehicle', 'Vehicle'), ('Classroom', 'Classroom')], editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='time_span',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.Func(models.Value('UTC'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('session_date'), '+', models.F('start_time')), output_field=models.DateTimeField()), function='timezone'), models.Func(models.Value('UTC'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('session_date'), '+', models.F('end_time')), output_field=models.DateTimeField()), function='timezone'), models.Value('[)'), function='tstzrange', output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.RunPython(populate_facility_types, migrations.RunPython.noop),
+        migrations.RunPython(check_double_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status__in', ['Scheduled', 'Completed'])), expressions=[('instructor', '='), ('time_span', '&&'), (django.db.models.functions.comparison.Coalesce('facility', django.db.models.expressions.CombinedExpression(models.F('session_id'), '*', models.Value(-1))), '<>')], name='exclude_overlapping_instructor_sessions'),
+        ),
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('facility_type', 'Vehicle'), ('status__in', ['Scheduled', 'Completed'])), expressions=[('facility', '='), ('time_span', '&&')], name='exclude_overlapping_vehicle_sessions'),
+        ),
+    ]
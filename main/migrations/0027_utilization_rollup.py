@@ -0,0 +1,77 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:07
+
+import django.db.models.deletion
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db import migrations, models
+from itertools import product
+
+SESSION_HOURS = {'PDC': 2.0, 'TDC': 7.5}
+
+
+class RangeAgg(models.Aggregate):
+    function = 'range_agg'
+    output_field = DateTimeRangeField()
+
+
+def populate_utilization_rollup(apps, schema_editor):
+    Session = apps.get_model('main', 'Session')
+    UtilizationRollup = apps.get_model('main', 'UtilizationRollup')
+
+    resources = {
+        'Instructor': {'resource_type': models.Value('Instructor', output_field=models.CharField()), 'resource_code': models.F('instructor_id')},
+        'Facility': {'resource_type': models.F('facility_type'), 'resource_code': models.F('facility__object_id')},
+    }
+    branches = [models.F('enrollment__branch'), models.Value(None, output_field=models.CharField())]
+
+    rows = {}
+    def row(record):
+        key = (record['date'], record['branch'], record['resource_type'], record['resource_code'])
+        if key not in rows:
+            rows[key] = UtilizationRollup(date=key[0], branch_id=key[1], resource_type=key[2], resource_code=key[3])
+        return rows[key]
+
+    for (resource, fields), branch in product(resources.items(), branches):
+        grouped = Session.objects.filter(facility__isnull=False) if resource == 'Facility' else Session.objects.all()
+        grouped = grouped.values(date=models.F('session_date'), branch=branch, **fields)
+
+        slot_counts = grouped.exclude(status__in=['Archived', 'Unavailable']).annotate(**{
+            category_type: models.Count('time_span', distinct=True, filter=models.Q(enrollment__course__course_category__category_type=category_type))
+            for category_type in SESSION_HOURS
+        })
+        for record in slot_counts:
+            row(record).hours_assigned = sum(record[category_type] * hours for category_type, hours in SESSION_HOURS.items())
+
+        spans = grouped.filter(status__in=['Scheduled', 'Completed']).annotate(
+            span=models.Func(RangeAgg('time_span'), function='unnest', output_field=DateTimeRangeField())
+        )
+        for record in spans:
+            row(record).merged_hours += (record['span'].upper - record['span'].lower).total_seconds() / 3600
+
+    UtilizationRollup.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0026_session_exclusion_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UtilizationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('resource_type', models.CharField(choices=[('Classroom', 'Classroom'), ('Vehicle', 'Vehicle'), ('Instructor', 'Instructor')], max_length=10)),
+                ('resource_code', models.CharField(max_length=20)),
+                ('hours_assigned', models.FloatField(default=0)),
+                ('merged_hours', models.FloatField(default=0)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='main.branch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['resource_type', 'date'], name='utilization_rollup_type_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'branch', 'resource_type', 'resource_code'), name='unique_utilization_rollup', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(populate_utilization_rollup, migrations.RunPython.noop),
+    ]
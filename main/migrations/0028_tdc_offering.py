@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:18
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+
+
+def populate_tdc_offerings(apps, schema_editor):
+    Classroom = apps.get_model('main', 'Classroom')
+    Session = apps.get_model('main', 'Session')
+    TdcOffering = apps.get_model('main', 'TdcOffering')
+
+    offerings = Session.objects.filter(
+        facility_type='Classroom',
+        status__in=['Scheduled', 'Completed'],
+        facility__object_id__in=Classroom.objects.values('classroom_code'),
+    ).values(
+        'session_date', 'start_time', 'end_time', 'session_nth', 'facility_id', 'instructor_id',
+        classroom_id=models.F('facility__object_id'),
+    ).annotate(
+        seats_taken=models.Count('session_id'),
+        branches=ArrayAgg('enrollment__branch', distinct=True, default=[]),
+    )
+    TdcOffering.objects.bulk_create([TdcOffering(**offering) for offering in offerings], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0027_utilization_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TdcOffering',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('session_nth', models.CharField(max_length=5)),
+                ('seats_taken', models.PositiveIntegerField(default=0)),
+                ('branches', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50), blank=True, default=list, size=None)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.classroom')),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.facility')),
+                ('instructor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.instructor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['session_nth', 'session_date'], name='tdc_offering_nth_date_idx'), models.Index(fields=['session_date', 'start_time', 'end_time'], name='tdc_offering_time_span_idx')],
+                'constraints': [models.UniqueConstraint(fields=('session_date', 'classroom', 'instructor', 'start_time', 'end_time', 'session_nth'), name='unique_tdc_offering')],
+            },
+        ),
+        migrations.RunPython(populate_tdc_offerings, migrations.RunPython.noop),
+    ]
@@ -9,4 +9,5 @@ from .vehicle import Vehicle
 from .student import Student
 from .user import User, UserManager
 from .session import Session
-
+from .utilization_rollup import UtilizationRollup
+from .tdc_offering import TdcOffering
@@ -1,6 +1,7 @@
 from django.db import models
 from .branch import Branch
 from .facility import Facility
+from ..analytics_cache import bump_data_version, saved_branch
 from django.contrib.contenttypes.models import ContentType
 
 class Classroom(models.Model):
@@ -27,16 +28,20 @@ class Classroom(models.Model):
     def save(self, *args, **kwargs):
         if not self.classroom_code:
             self.generate_unique_classroom_code()
+        previous_branch = saved_branch(self)
         super(Classroom, self).save(*args, **kwargs)
-        Facility.objects.get_or_create(
+        Facility.objects.update_or_create(
             facility_type='Classroom',
             content_type=ContentType.objects.get_for_model(self),
             object_id=self.classroom_code,
+            defaults={'display_name': str(self)},
         )
+        bump_data_version({self.branch_id, previous_branch})
 
     def delete(self, *args, **kwargs):
         Facility.objects.filter(content_type=ContentType.objects.get_for_model(self), object_id=self.classroom_code).delete()
         super(Classroom, self).delete(*args, **kwargs)
+        bump_data_version({self.branch_id})
 
     def __str__(self):
         return f'{self.classroom_code} / {self.branch.branch_name}'
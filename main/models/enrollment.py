@@ -1,9 +1,30 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.postgres.fields import ArrayField
 from django.utils import timezone
 from .branch import Branch
 from .student import Student
 from .course import Course
+from .utilization_rollup import UtilizationRollup
+from .tdc_offering import TdcOffering
+from ..utils import calculate_total_sessions, total_sessions_expression
+from ..analytics_cache import bump_data_version, saved_branch
+
+class EnrollmentQuerySet(models.QuerySet):
+    def with_actual_session_counts(self):
+        return self.annotate(**{
+            f'actual_{field}': Count('session', filter=Q(session__status=session_status))
+            for session_status, field in Enrollment.SESSION_COUNTER_FIELDS.items()
+        })
+
+    def with_session_progress(self):
+        return self.annotate(
+            total_sessions=total_sessions_expression(),
+            scheduled_sessions=Count('session', filter=Q(session__status__in=['Scheduled', 'Completed'])),
+            completed_sessions=Count('session', filter=Q(session__status='Completed')),
+        )
+
 
 class Enrollment(models.Model):
     STATUS_CHOICES = [
@@ -22,6 +43,13 @@ class Enrollment(models.Model):
         ('NA', 'NA'),
     ]
 
+    SESSION_COUNTER_FIELDS = {
+        'Scheduled': 'scheduled_count',
+        'Completed': 'completed_count',
+        'Missed': 'missed_count',
+        'Cancelled': 'cancelled_count',
+    }
+
     enrollment_id = models.AutoField(primary_key=True)
     enrollment_date = models.DateField(default=timezone.now)
     branch = models.ForeignKey(Branch, on_delete=models.CASCADE)
@@ -37,6 +65,89 @@ class Enrollment(models.Model):
     )
     remarks = models.TextField(blank=True, null=True, help_text="Additional comments or information related to the enrollment.")
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='Awaiting Action')
+    scheduled_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_count = models.PositiveIntegerField(default=0, editable=False)
+    missed_count = models.PositiveIntegerField(default=0, editable=False)
+    cancelled_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = EnrollmentQuerySet.as_manager()
+
+    @classmethod
+    def adjust_session_counter(cls, enrollment_id, session_status, delta):
+        field = cls.SESSION_COUNTER_FIELDS.get(session_status)
+        if enrollment_id is None or field is None or not delta:
+            return
+
+        cls.objects.filter(pk=enrollment_id).update(**{field: Greatest(F(field) + delta, 0)})
+
+    @classmethod
+    def sync_session_counters(cls, enrollment_ids):
+        enrollments = list(
+            cls.objects.filter(pk__in=enrollment_ids)
+            .select_related('course__course_category')
+            .with_actual_session_counts()
+        )
+
+        for enrollment in enrollments:
+            for field in cls.SESSION_COUNTER_FIELDS.values():
+                setattr(enrollment, field, getattr(enrollment, f'actual_{field}'))
+            enrollment.status = enrollment.resolve_status()
+
+        cls.objects.bulk_update(enrollments, [*cls.SESSION_COUNTER_FIELDS.values(), 'status'])
+        return enrollments
+
+    def get_total_sessions(self):
+        return calculate_total_sessions(self.course.course_code, self.course.course_category.category_type, self.total_hours)
+
+    def resolve_status(self):
+        total_sessions = self.get_total_sessions()
+        scheduled_sessions = self.scheduled_count
+        completed_sessions = self.completed_count
+
+        if total_sessions == 0:
+            return 'Awaiting Action'
+        elif scheduled_sessions + completed_sessions < total_sessions:
+            return 'Awaiting Follow-Up'
+        elif completed_sessions == total_sessions:
+            return 'Completed'
+        elif completed_sessions > 0 and completed_sessions < total_sessions:
+            return 'In Progress'
+        elif scheduled_sessions == total_sessions:
+            return 'All Sessions Scheduled'
+        elif self.missed_count > 0 or self.cancelled_count > 0:
+            return 'Awaiting Follow-Up'
+        return 'Awaiting Action'
+
+    def refresh_status(self):
+        self.refresh_from_db(fields=['status', *self.SESSION_COUNTER_FIELDS.values()])
+
+        status = self.resolve_status()
+        if status != self.status:
+            self.status = status
+            Enrollment.objects.filter(pk=self.pk).update(status=status)
+
+    def save(self, *args, **kwargs):
+        previous_branch = saved_branch(self)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous_branch is not None and previous_branch != self.branch_id:
+                self.refresh_branch_rollups()
+        bump_data_version({self.branch_id, previous_branch})
+
+    def refresh_branch_rollups(self):
+        # THE ROLLUP ROWS AND TDC CLASS BRANCHES OF THIS ENROLLMENT'S SESSIONS ARE KEYED BY ITS BRANCH
+        sessions = list(self.session_set.values_list('session_date', 'instructor_id', 'facility_id', 'facility_type'))
+        UtilizationRollup.refresh(
+            {session_date for session_date, *_ in sessions},
+            instructors={instructor_id for _, instructor_id, *_ in sessions},
+            facilities={facility_id for _, _, facility_id, _ in sessions},
+        )
+        TdcOffering.refresh({session_date for session_date, *_, facility_type in sessions if facility_type == 'Classroom'})
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_data_version({self.branch_id})
+        return result
 
     def __str__(self):
         return str(self.enrollment_id)
@@ -12,6 +12,27 @@ class Facility(models.Model):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.CharField()
     facility = GenericForeignKey('content_type', 'object_id')
+    display_name = models.CharField(max_length=255, blank=True, default='')
+
+    @classmethod
+    def resolve_display_names(cls, facilities):
+        names = {}
+        unresolved = {}
+        for facility in facilities:
+            if facility.display_name:
+                names[facility.id] = facility.display_name
+            else:
+                unresolved.setdefault(facility.content_type_id, []).append(facility)
+
+        # LOAD EACH FACILITY MODEL ONCE FOR ALL FACILITIES WITHOUT A STORED NAME
+        for content_type_id, pending in unresolved.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            instances = model.objects.select_related('branch').in_bulk({facility.object_id for facility in pending})
+            for facility in pending:
+                instance = instances.get(facility.object_id)
+                names[facility.id] = str(instance) if instance else None
+
+        return names
 
     def __str__(self):
         return f"{self.object_id}"
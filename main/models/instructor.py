@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from datetime import datetime
 from .branch import Branch
+from ..analytics_cache import bump_data_version, saved_branch
 
 class Instructor(models.Model):
     STATUS_CHOICES = [
@@ -28,7 +29,14 @@ class Instructor(models.Model):
             self.user.last_name = self.last_name
             self.user.save()
 
+        previous_branch = saved_branch(self)
         super().save(*args, **kwargs)
+        bump_data_version({self.branch_id, previous_branch})
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_data_version({self.branch_id})
+        return result
 
     def generate_auto_instructor_code(self):
         prefix = "INS-"
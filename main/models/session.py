@@ -1,11 +1,22 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Func, Q, Value
+from django.db.models.functions import Coalesce
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
 from .enrollment import Enrollment
 from .instructor import Instructor
 from .facility import Facility
-import math
+from .utilization_rollup import UtilizationRollup
+from .tdc_offering import TdcOffering
+from ..analytics_cache import bump_data_version
+from itertools import groupby
+from operator import attrgetter
+
+INSTRUCTOR_OVERLAP_CONSTRAINT = 'exclude_overlapping_instructor_sessions'
+VEHICLE_OVERLAP_CONSTRAINT = 'exclude_overlapping_vehicle_sessions'
 
 class Session(models.Model):
     SESSION_NTH_CHOICES = [
@@ -21,6 +32,10 @@ class Session(models.Model):
         ('Archived', 'Archived')
     ]
 
+    TRACKED_FIELDS = ['enrollment_id', 'session_date', 'start_time', 'status']
+    LOADED_FIELDS = [*TRACKED_FIELDS, 'end_time', 'instructor_id', 'facility_id', 'facility_type']
+    SCHEDULE_FIELDS = ['session_date', 'start_time', 'end_time', 'enrollment', 'instructor', 'facility', 'facility_type', 'status']
+
     session_id = models.AutoField(primary_key=True)
     session_nth = models.CharField(
         max_length=5,
@@ -37,7 +52,44 @@ class Session(models.Model):
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE)
     instructor = models.ForeignKey(Instructor, on_delete=models.CASCADE)
     facility = models.ForeignKey(Facility, null=True, blank=True, on_delete=models.SET_NULL)
+    facility_type = models.CharField(max_length=10, choices=Facility.FACILITY_TYPE_CHOICES, blank=True, editable=False)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='Scheduled')
+    time_span = models.GeneratedField(
+        expression=Func(
+            Func(Value('UTC'), ExpressionWrapper(F('session_date') + F('start_time'), output_field=models.DateTimeField()), function='timezone'),
+            Func(Value('UTC'), ExpressionWrapper(F('session_date') + F('end_time'), output_field=models.DateTimeField()), function='timezone'),
+            Value('[)'),
+            function='tstzrange',
+            output_field=DateTimeRangeField(),
+        ),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['session_date', 'start_time', 'end_time'], name='session_time_span_idx'),
+            models.Index(fields=['instructor', 'session_date', 'start_time', 'end_time'], name='session_instructor_span_idx'),
+            models.Index(fields=['facility', 'session_date', 'start_time', 'end_time'], name='session_facility_span_idx'),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=INSTRUCTOR_OVERLAP_CONSTRAINT,
+                # AN INSTRUCTOR MAY TEACH SEVERAL STUDENTS IN THE SAME ROOM (TDC), JUST NOT TWO PLACES AT ONCE;
+                # A MISSING FACILITY FALLS BACK TO THE SESSION'S OWN (NEGATED) ID SO IT NEVER COUNTS AS THE SAME ROOM
+                expressions=[
+                    ('instructor', RangeOperators.EQUAL),
+                    ('time_span', RangeOperators.OVERLAPS),
+                    (Coalesce('facility', -F('session_id')), RangeOperators.NOT_EQUAL),
+                ],
+                condition=Q(status__in=['Scheduled', 'Completed']),
+            ),
+            ExclusionConstraint(
+                name=VEHICLE_OVERLAP_CONSTRAINT,
+                expressions=[('facility', RangeOperators.EQUAL), ('time_span', RangeOperators.OVERLAPS)],
+                condition=Q(status__in=['Scheduled', 'Completed'], facility_type='Vehicle'),
+            ),
+        ]
 
     def clean(self):
         if self.facility is None:
@@ -50,56 +102,171 @@ class Session(models.Model):
         if course_category == 'TDC' and self.facility.facility_type != 'Classroom':
             raise ValidationError(_('For TDC courses, the facility must be a classroom.'))
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: value for field, value in zip(field_names, values)
+            if field in cls.LOADED_FIELDS
+        }
+        return instance
+
+    def get_previous_values(self):
+        if self._state.adding:
+            return None
+
+        previous = getattr(self, '_loaded_values', {})
+        if len(previous) < len(self.LOADED_FIELDS):
+            previous = Session.objects.filter(pk=self.pk).values(*self.LOADED_FIELDS, 'session_nth').first()
+        elif previous['facility_type'] == 'Classroom':
+            # RENUMBERING OTHER SESSIONS CHANGES THIS ONE'S STORED NUMBER, WHICH KEYS ITS TDC CLASS
+            previous = {**previous, 'session_nth': Session.objects.filter(pk=self.pk).values_list('session_nth', flat=True).first()}
+        return previous
+
+    def slot_values(self):
+        return {field: getattr(self, field) for field in [*self.LOADED_FIELDS, 'session_nth']}
+
+    def offering_change(self, previous, deleted=False):
+        # (PREVIOUS CLASS, CLASS AS WRITTEN, CLASSROOM CODE) FOR TdcOffering.apply
+        current = None if deleted else self.slot_values()
+        return (
+            previous and TdcOffering.slot(previous),
+            current and TdcOffering.slot(current),
+            self.facility.object_id if self.facility else None,
+        )
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
-        
-        self.update_session_nth()
-        self.update_enrollment_status()
-
-    def update_session_nth(self):
-        sessions = Session.objects.filter(
-            enrollment=self.enrollment, 
-            status__in=['Scheduled', 'Completed']
-        ).order_by('session_date', 'start_time')
+        self.facility_type = self.facility.facility_type if self.facility else ''
+        previous = self.get_previous_values()
 
-        for i, session in enumerate(sessions):
-            session.session_nth = str(i + 1)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
-        Session.objects.bulk_update(sessions, ['session_nth'])
+            # SEAT MOVES FOR THIS SESSION AS WRITTEN, THEN FOR ANY SESSIONS RENUMBERED BELOW, APPLIED TOGETHER
+            offering_changes = [self.offering_change(previous)]
 
-    def update_enrollment_status(self):
+            self.update_enrollment_counters(previous)
+
+            if previous is None or any(previous[field] != getattr(self, field) for field in self.TRACKED_FIELDS):
+                offering_changes += self.update_session_nth()
+
+            self.update_enrollment_status()
+
+            branches = {self.enrollment.branch_id}
+            if previous is not None and previous['enrollment_id'] != self.enrollment_id:
+                previous_enrollment = Enrollment.objects.get(pk=previous['enrollment_id'])
+                offering_changes += self.update_session_nth(previous_enrollment)
+                previous_enrollment.refresh_status()
+                branches.add(previous_enrollment.branch_id)
+
+            TdcOffering.apply(offering_changes)
+            UtilizationRollup.refresh(
+                {self.session_date, previous and previous['session_date']},
+                instructors={self.instructor_id, previous and previous['instructor_id']},
+                facilities={self.facility_id, previous and previous['facility_id']},
+            )
+            bump_data_version(branches)
+
+        self._loaded_values = {field: getattr(self, field) for field in self.LOADED_FIELDS}
+
+    def delete(self, *args, **kwargs):
         enrollment = self.enrollment
-        course_category = self.enrollment.course.course_category.category_type
+        previous = self.get_previous_values() or self.slot_values()
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+
+            Enrollment.adjust_session_counter(enrollment.pk, previous['status'], -1)
+            offering_changes = [self.offering_change(previous, deleted=True), *self.update_session_nth(enrollment)]
+            enrollment.refresh_status()
+            TdcOffering.apply(offering_changes)
+            UtilizationRollup.refresh({previous['session_date']}, instructors={previous['instructor_id']}, facilities={previous['facility_id']})
+            bump_data_version({enrollment.branch_id})
+        return result
+
+    def update_enrollment_counters(self, previous):
+        previous_enrollment_id, previous_status = (previous['enrollment_id'], previous['status']) if previous else (None, None)
+
+        if (previous_enrollment_id, previous_status) == (self.enrollment_id, self.status):
+            return
+
+        Enrollment.adjust_session_counter(previous_enrollment_id, previous_status, -1)
+        Enrollment.adjust_session_counter(self.enrollment_id, self.status, 1)
+
+    @classmethod
+    def renumber_sessions(cls, enrollment_ids):
+        sessions = cls.objects.filter(
+            enrollment_id__in=enrollment_ids,
+            status__in=['Scheduled', 'Completed']
+        ).order_by('enrollment_id', 'session_date', 'start_time').select_related('facility').only(
+            'session_id', 'session_nth', 'facility__object_id', *cls.LOADED_FIELDS
+        )
+
+        numbering = {}
+        renumbered = []
+        offering_changes = []
+        for _, enrollment_sessions in groupby(sessions, key=attrgetter('enrollment_id')):
+            for i, session in enumerate(enrollment_sessions):
+                numbering[session.session_id] = str(i + 1)
+                if session.session_nth != numbering[session.session_id]:
+                    # TDC CLASSES ARE KEYED BY SESSION NUMBER, SO A RENUMBERED SESSION MOVES ITS SEAT
+                    previous = session.slot_values()
+                    session.session_nth = numbering[session.session_id]
+                    renumbered.append(session)
+                    offering_changes.append(session.offering_change(previous))
+
+        cls.objects.bulk_update(renumbered, ['session_nth'])
+        return numbering, offering_changes
 
-        if course_category == 'PDC':
-            total_sessions = math.ceil(enrollment.total_hours / 2)
-        elif course_category == 'TDC':
-            total_sessions = math.ceil(enrollment.total_hours / 7.5)
-        else:
-            total_sessions = 0
-
-        scheduled_sessions = Session.objects.filter(enrollment=enrollment, status='Scheduled').count()
-        completed_sessions = Session.objects.filter(enrollment=enrollment, status='Completed').count()
-        missed_sessions = Session.objects.filter(enrollment=enrollment, status='Missed').count()
-        cancelled_sessions = Session.objects.filter(enrollment=enrollment, status='Cancelled').count()
-
-        if total_sessions == 0:
-            enrollment.status = 'Awaiting Action'
-        elif scheduled_sessions + completed_sessions < total_sessions:
-            enrollment.status = 'Awaiting Follow-Up'
-        elif completed_sessions == total_sessions:
-            enrollment.status = 'Completed'
-        elif completed_sessions > 0 and completed_sessions < total_sessions:
-            enrollment.status = 'In Progress'
-        elif scheduled_sessions == total_sessions:
-            enrollment.status = 'All Sessions Scheduled'
-        elif missed_sessions > 0 or cancelled_sessions > 0:
-            enrollment.status = 'Awaiting Follow-Up'
-        else:
-            enrollment.status = 'Awaiting Action'
-
-        enrollment.save()
+    @classmethod
+    def previous_values(cls, sessions):
+        # STORED VALUES PER SESSION ID IN ONE QUERY, INCLUDING SESSION NUMBERS THAT RENUMBERING MAY HAVE CHANGED
+        return {
+            values.pop('session_id'): values
+            for values in cls.objects.filter(pk__in=[session.session_id for session in sessions]).values('session_id', 'session_nth', *cls.LOADED_FIELDS)
+        }
+
+    @classmethod
+    def bulk_schedule(cls, created=(), updated=()):
+        previous = cls.previous_values(updated)
+        enrollment_ids = {session.enrollment_id for session in [*created, *updated]}
+        enrollment_ids.update(values['enrollment_id'] for values in previous.values())
+        session_dates = {session.session_date for session in [*created, *updated]}
+        session_dates.update(values['session_date'] for values in previous.values())
+        instructors = {session.instructor_id for session in [*created, *updated]}
+        instructors.update(values['instructor_id'] for values in previous.values())
+        facilities = {session.facility_id for session in [*created, *updated]}
+        facilities.update(values['facility_id'] for values in previous.values())
+
+        for session in [*created, *updated]:
+            session.facility_type = session.facility.facility_type if session.facility else ''
+
+        with transaction.atomic():
+            created = cls.objects.bulk_create(created)
+            cls.objects.bulk_update(updated, cls.SCHEDULE_FIELDS)
+
+            offering_changes = [session.offering_change(None) for session in created]
+            offering_changes += [session.offering_change(previous.get(session.session_id)) for session in updated]
+            numbering, renumber_changes = cls.renumber_sessions(enrollment_ids)
+            Enrollment.sync_session_counters(enrollment_ids)
+            TdcOffering.apply([*offering_changes, *renumber_changes])
+            UtilizationRollup.refresh(session_dates, instructors=instructors, facilities=facilities)
+            bump_data_version(Enrollment.objects.filter(pk__in=enrollment_ids).values_list('branch', flat=True))
+
+        for session in [*created, *updated]:
+            session.session_nth = numbering.get(session.session_id, session.session_nth)
+            session._loaded_values = {field: getattr(session, field) for field in cls.LOADED_FIELDS}
+
+        return created
+
+    def update_session_nth(self, enrollment=None):
+        numbering, offering_changes = Session.renumber_sessions([(enrollment or self.enrollment).pk])
+        self.session_nth = numbering.get(self.session_id, self.session_nth)
+        return offering_changes
+
+    def update_enrollment_status(self):
+        self.enrollment.refresh_status()
 
     def __str__(self):
         return f'Session {self.session_id}'
@@ -0,0 +1,114 @@
+from django.db import connection, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
+from .classroom import Classroom
+from .facility import Facility
+from .instructor import Instructor
+from collections import defaultdict
+
+
+class TdcOffering(models.Model):
+    session_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    session_nth = models.CharField(max_length=5)
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
+    facility = models.ForeignKey(Facility, on_delete=models.CASCADE)
+    instructor = models.ForeignKey(Instructor, on_delete=models.CASCADE)
+    seats_taken = models.PositiveIntegerField(default=0)
+    branches = ArrayField(models.CharField(max_length=50), default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['session_date', 'classroom', 'instructor', 'start_time', 'end_time', 'session_nth'],
+                name='unique_tdc_offering'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['session_nth', 'session_date'], name='tdc_offering_nth_date_idx'),
+            models.Index(fields=['session_date', 'start_time', 'end_time'], name='tdc_offering_time_span_idx'),
+        ]
+
+    ACTIVE_STATUSES = ['Scheduled', 'Completed']
+    SLOT_FIELDS = ['session_date', 'start_time', 'end_time', 'session_nth', 'instructor_id', 'facility_id']
+
+    @classmethod
+    def slot(cls, values):
+        # THE CLASS A SESSION (OR ITS STORED VALUES) TAKES A SEAT IN, OR NONE FOR PDC AND INACTIVE SESSIONS
+        if values.get('facility_type') != 'Classroom' or values.get('status') not in cls.ACTIVE_STATUSES:
+            return None
+        return tuple(values[field] for field in cls.SLOT_FIELDS)
+
+    @classmethod
+    def apply(cls, changes):
+        # changes: (previous slot, current slot, classroom code) PER WRITTEN SESSION, EITHER SLOT MAY BE NONE
+        from .session import Session
+
+        deltas = defaultdict(int)
+        classrooms = {}
+        for previous, current, classroom_id in changes:
+            if previous is not None:
+                deltas[previous] -= 1
+            if current is not None:
+                deltas[current] += 1
+                classrooms[current] = classroom_id
+
+        # ONE CLASS AT A TIME IN A FIXED ORDER; THE F() UPDATE HOLDS ITS ROW UNTIL COMMIT
+        for slot in sorted(deltas):
+            key = dict(zip(cls.SLOT_FIELDS, slot))
+            offering = cls.objects.filter(**key)
+
+            if deltas[slot] > 0:
+                cls.objects.bulk_create([cls(**key, classroom_id=classrooms[slot])], ignore_conflicts=True)
+            offering.update(seats_taken=Greatest(F('seats_taken') + deltas[slot], 0))
+
+            # BRANCHES ARE RE-READ ONCE THE ROW IS LOCKED, SO THEY INCLUDE EVERY COMMITTED STUDENT OF THE CLASS
+            offering.update(branches=ArraySubquery(
+                Session.objects.filter(**key, facility_type='Classroom', status__in=cls.ACTIVE_STATUSES)
+                .order_by('enrollment__branch').values('enrollment__branch').distinct()
+            ))
+            offering.filter(seats_taken=0).delete()
+
+    @classmethod
+    def refresh(cls, dates=None):
+        # RECOMPUTE THE CLASSES HELD ON THE GIVEN DATES FROM THE SESSIONS TABLE (ALL DATES IF NONE)
+        from .session import Session
+
+        sessions = Session.objects.filter(
+            facility_type='Classroom',
+            status__in=['Scheduled', 'Completed'],
+            facility__object_id__in=Classroom.objects.values('classroom_code'),
+        )
+        if dates is not None:
+            dates = {date for date in dates if date is not None}
+            if not dates:
+                return 0
+            sessions = sessions.filter(session_date__in=dates)
+
+        # ONE ROW PER CLASS, WITH ITS HEADCOUNT AND THE BRANCHES ITS STUDENTS ENROLLED FROM
+        offerings = [
+            cls(**offering)
+            for offering in sessions.values(
+                'session_date', 'start_time', 'end_time', 'session_nth', 'facility_id', 'instructor_id',
+                classroom_id=F('facility__object_id'),
+            ).annotate(
+                seats_taken=Count('session_id'),
+                branches=ArrayAgg('enrollment__branch', distinct=True, default=[]),
+            )
+        ]
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {cls._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+            stale = cls.objects.all() if dates is None else cls.objects.filter(session_date__in=dates)
+            stale.delete()
+            cls.objects.bulk_create(offerings, batch_size=1000)
+
+        return len(offerings)
+
+    def __str__(self):
+        return f"{self.session_date} {self.start_time}-{self.end_time} {self.classroom_id} / {self.instructor_id}"
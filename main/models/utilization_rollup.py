@@ -0,0 +1,150 @@
+from django.db import connection, models, transaction
+from django.db.models import Aggregate, Count, F, Func, Q, Value
+from django.contrib.postgres.fields import DateTimeRangeField
+from .branch import Branch
+from itertools import product
+
+
+class RangeAgg(Aggregate):
+    function = 'range_agg'
+    output_field = DateTimeRangeField()
+
+
+class UtilizationRollup(models.Model):
+    RESOURCE_TYPE_CHOICES = [
+        ('Classroom', 'Classroom'),
+        ('Vehicle', 'Vehicle'),
+        ('Instructor', 'Instructor'),
+    ]
+
+    SESSION_HOURS = {'PDC': 2.0, 'TDC': 7.5}
+
+    date = models.DateField()
+    branch = models.ForeignKey(Branch, null=True, blank=True, on_delete=models.CASCADE)
+    resource_type = models.CharField(max_length=10, choices=RESOURCE_TYPE_CHOICES)
+    resource_code = models.CharField(max_length=20)
+    hours_assigned = models.FloatField(default=0)
+    merged_hours = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'branch', 'resource_type', 'resource_code'], name='unique_utilization_rollup', nulls_distinct=False),
+        ]
+        indexes = [
+            models.Index(fields=['resource_type', 'date'], name='utilization_rollup_type_idx'),
+        ]
+
+    # pg_advisory_xact_lock NAMESPACE; THE SECOND KEY IS THE DATE'S ORDINAL
+    LOCK_NAMESPACE = 7301
+
+    @classmethod
+    def lock_dates(cls, dates):
+        # SERIALIZE REFRESHES OF THE SAME DATE UNTIL COMMIT; SORTED SO TWO WRITERS NEVER WAIT ON EACH OTHER IN A CYCLE
+        with connection.cursor() as cursor:
+            for date in sorted(dates):
+                cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [cls.LOCK_NAMESPACE, date.toordinal()])
+
+    @classmethod
+    def compute(cls, resources):
+        resource_fields = {
+            'Instructor': {'resource_type': Value('Instructor', output_field=models.CharField()), 'resource_code': F('instructor_id')},
+            'Facility': {'resource_type': F('facility_type'), 'resource_code': F('facility__object_id')},
+        }
+
+        rows = {}
+        def row(record):
+            key = (record['date'], record['branch'], record['resource_type'], record['resource_code'])
+            if key not in rows:
+                rows[key] = cls(date=key[0], branch_id=key[1], resource_type=key[2], resource_code=key[3])
+            return rows[key]
+
+        # ROWS PER BRANCH PLUS AN ALL-BRANCHES ROW (BRANCH NULL), SINCE SHARED SLOTS CAN SPAN BRANCHES
+        branches = [F('enrollment__branch'), Value(None, output_field=models.CharField())]
+
+        for (resource, fields), branch in product(resource_fields.items(), branches):
+            if resources.get(resource) is None:
+                continue
+
+            grouped = resources[resource].values(date=F('session_date'), branch=branch, **fields)
+
+            # HOURS ASSIGNED: EACH DISTINCT SLOT COUNTS ONCE AT ITS COURSE TYPE'S HOURS
+            slot_counts = grouped.exclude(status__in=['Archived', 'Unavailable']).annotate(**{
+                category_type: Count('time_span', distinct=True, filter=Q(enrollment__course__course_category__category_type=category_type))
+                for category_type in cls.SESSION_HOURS
+            })
+            for record in slot_counts:
+                row(record).hours_assigned = sum(record[category_type] * hours for category_type, hours in cls.SESSION_HOURS.items())
+
+            # MERGED HOURS: OVERLAPPING SCHEDULED OR COMPLETED SESSIONS COUNT ONCE
+            spans = grouped.filter(status__in=['Scheduled', 'Completed']).annotate(
+                span=Func(RangeAgg('time_span'), function='unnest', output_field=DateTimeRangeField())
+            )
+            for record in spans:
+                row(record).merged_hours += (record['span'].upper - record['span'].lower).total_seconds() / 3600
+
+        return rows
+
+    @classmethod
+    def refresh(cls, dates=None, instructors=None, facilities=None):
+        # RECOMPUTE THE ROWS OF THE GIVEN DATES FROM THE SESSIONS TABLE (ALL DATES IF NONE),
+        # LIMITED TO THE GIVEN INSTRUCTOR CODES AND FACILITY IDS WHEN EITHER IS PASSED
+        from .session import Session
+        from .facility import Facility
+
+        if dates is None:
+            sessions = Session.objects.all()
+            rows = cls.compute({'Instructor': sessions, 'Facility': sessions.filter(facility__isnull=False)})
+
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE {cls._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+                cls.objects.all().delete()
+                cls.objects.bulk_create(rows.values(), batch_size=1000)
+            return len(rows)
+
+        dates = {date for date in dates if date is not None}
+        if not dates:
+            return 0
+
+        sessions = Session.objects.filter(session_date__in=dates)
+        stale = cls.objects.filter(date__in=dates)
+        if instructors is not None or facilities is not None:
+            instructors = {code for code in instructors or () if code is not None}
+            facilities = {facility_id for facility_id in facilities or () if facility_id is not None}
+            facility_codes = Facility.objects.filter(pk__in=facilities).values_list('object_id', flat=True)
+            stale = stale.filter(
+                Q(resource_type='Instructor', resource_code__in=instructors)
+                | Q(resource_type__in=['Vehicle', 'Classroom'], resource_code__in=facility_codes)
+            )
+            resources = {
+                'Instructor': sessions.filter(instructor_id__in=instructors) if instructors else None,
+                'Facility': sessions.filter(facility_id__in=facilities) if facilities else None,
+            }
+        else:
+            resources = {'Instructor': sessions, 'Facility': sessions.filter(facility__isnull=False)}
+
+        with transaction.atomic():
+            cls.lock_dates(dates)
+
+            # RECOMPUTED AFTER THE LOCK, SO A CONCURRENT WRITER'S COMMITTED SESSIONS ARE INCLUDED
+            rows = cls.compute(resources)
+
+            # UPSERT THE AFFECTED ROWS AND DROP ONLY THOSE WHOSE RESOURCE NO LONGER HAS SESSIONS THAT DAY
+            cls.objects.bulk_create(
+                rows.values(),
+                update_conflicts=True,
+                unique_fields=['date', 'branch', 'resource_type', 'resource_code'],
+                update_fields=['hours_assigned', 'merged_hours'],
+                batch_size=1000,
+            )
+            stale_ids = [
+                pk for pk, *key in stale.values_list('pk', 'date', 'branch', 'resource_type', 'resource_code')
+                if tuple(key) not in rows
+            ]
+            if stale_ids:
+                cls.objects.filter(pk__in=stale_ids).delete()
+
+        return len(rows)
+
+    def __str__(self):
+        return f"{self.date} {self.resource_type} {self.resource_code} / {self.branch_id}"
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.contenttypes.models import ContentType
 from .branch import Branch
 from .facility import Facility
+from ..analytics_cache import bump_data_version, saved_branch
 
 class Vehicle(models.Model):
     WHEEL_NUM_CHOICES = [
@@ -54,16 +55,20 @@ class Vehicle(models.Model):
     def save(self, *args, **kwargs):
         if not self.vehicle_code:
             self.generate_unique_vehicle_code()
+        previous_branch = saved_branch(self)
         super(Vehicle, self).save(*args, **kwargs)
-        Facility.objects.get_or_create(
+        Facility.objects.update_or_create(
             facility_type='Vehicle',
             content_type=ContentType.objects.get_for_model(self),
             object_id=self.vehicle_code,
+            defaults={'display_name': str(self)},
         )
+        bump_data_version({self.branch_id, previous_branch})
 
     def delete(self, *args, **kwargs):
         Facility.objects.filter(content_type=ContentType.objects.get_for_model(self), object_id=self.vehicle_code).delete()
         super(Vehicle, self).delete(*args, **kwargs)
+        bump_data_version({self.branch_id})
 
     def __str__(self):
         return f"{self.vehicle_model} {self.transmission_type} {self.color} / {self.branch.branch_name}"
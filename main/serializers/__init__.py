@@ -8,4 +8,4 @@ from .instructor import InstructorSerializer
 from .vehicle import VehicleSerializer
 from .student import StudentSerializer
 from .enrollment import EnrollmentSerializer
-from .session import SessionSerializer
+from .session import SessionSerializer, SessionBatchItemSerializer
@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from datetime import datetime
-from ..models import Classroom, Session
+from ..models import Classroom
+from ..availability import parse_window_params, classroom_occupancy
 
 class ClassroomSerializer(serializers.ModelSerializer):
     slots_available = serializers.SerializerMethodField()
@@ -10,31 +10,18 @@ class ClassroomSerializer(serializers.ModelSerializer):
         fields = ['classroom_code', 'capacity', 'status', 'branch', 'slots_available']
 
     def get_slots_available(self, obj):
-        request = self.context.get('request', None)
-        if request is None:
+        occupancy = self.get_occupancy()
+        if occupancy is None:
             return obj.capacity
 
-        date = request.query_params.get('date', None)
-        start_time = request.query_params.get('start_time', None)
-        end_time = request.query_params.get('end_time', None)
-
-        if date and start_time:
-            start_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
-            
-            if end_time:
-                end_datetime = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M")
-            else:
-                end_datetime = datetime.strptime(f"{date} 23:59", "%Y-%m-%d %H:%M")
-
-            busy_sessions = Session.objects.filter(
-                session_date=start_datetime.date(),
-                start_time__lt=end_datetime.time(),
-                end_time__gt=start_datetime.time(),
-                facility__facility_type='Classroom',
-                facility__object_id=obj.classroom_code
-            )
-
-            occupied_slots = busy_sessions.count()
-            return max(0, obj.capacity - occupied_slots)
-
-        return obj.capacity 
\ No newline at end of file
+        return max(0, obj.capacity - occupancy.get(obj.classroom_code, 0))
+
+    def get_occupancy(self):
+        # OCCUPIED SEATS PER CLASSROOM FOR THE REQUESTED WINDOW, BUILT ONCE AND SHARED BY EVERY ROW OF THE REQUEST
+        if 'occupancy' not in self.context:
+            request = self.context.get('request', None)
+            window = parse_window_params(request.query_params) if request is not None else None
+            self.context['occupancy'] = window and {
+                row['classroom']: row['occupied'] for row in classroom_occupancy(*window)
+            }
+        return self.context['occupancy']
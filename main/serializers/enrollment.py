@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from ..models import Enrollment, Session
+from ..models import Enrollment
+from ..utils import calculate_total_sessions
 
 class EnrollmentSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.first_name', read_only=True)
@@ -19,28 +20,26 @@ class EnrollmentSerializer(serializers.ModelSerializer):
             'preferred_dates', 'remarks', 'status', 'total_sessions', 'scheduled_sessions', 'completed_sessions'
         ]
 
-    def get_total_sessions(self, obj):
-        course_code = obj.course.course_code
-        course_category = obj.course.course_category.category_code
-        total_hours = obj.total_hours
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('student', 'course__course_category', 'branch').with_session_progress()
+
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        instance.__dict__.pop('total_sessions', None)
+        return instance
 
-        if course_code == 'ASS':
-            return 1
-        elif course_category in ['4W', '2W/3W', 'SDC']:
-            return total_hours // 2
-        elif course_category == 'TDC':
-            return int(total_hours // 7.5)
-        else:
-            return 0
+    def get_total_sessions(self, obj):
+        if hasattr(obj, 'total_sessions'):
+            return obj.total_sessions
+        return calculate_total_sessions(obj.course.course_code, obj.course.course_category.category_type, obj.total_hours)
 
     def get_scheduled_sessions(self, obj):
-        return Session.objects.filter(
-            enrollment=obj,
-            status__in = ['Scheduled', 'Completed']
-        ).count()
+        if hasattr(obj, 'scheduled_sessions'):
+            return obj.scheduled_sessions
+        return obj.scheduled_count + obj.completed_count
 
     def get_completed_sessions(self, obj):
-        return Session.objects.filter(
-            enrollment=obj,
-            status='Completed'
-        ).count()
\ No newline at end of file
+        if hasattr(obj, 'completed_sessions'):
+            return obj.completed_sessions
+        return obj.completed_count
@@ -1,7 +1,17 @@
 from rest_framework import serializers
-from ..models import Session, Facility, Vehicle, Classroom
+from ..models import Session, Facility
 from ..serializers import EnrollmentSerializer
 
+
+class SessionListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        sessions = list(data.all() if hasattr(data, 'all') else data)
+        self.child.facility_names = Facility.resolve_display_names(
+            {session.facility for session in sessions if session.facility}
+        )
+        return super().to_representation(sessions)
+
+
 class SessionSerializer(serializers.ModelSerializer):
     course = serializers.CharField(source='enrollment.course.course_code', read_only=True)
     course_name = serializers.CharField(source='enrollment.course.course_name', read_only=True)
@@ -22,7 +32,24 @@ class SessionSerializer(serializers.ModelSerializer):
             'course_category', 'student', 'student_code', 'branch', 'instructor', 'instructor_name', 
             'facility', 'facility_code', 'facility_name', 'status'
         ]
-    
+        list_serializer_class = SessionListSerializer
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related(
+            'enrollment__course__course_category', 'enrollment__student', 'enrollment__branch',
+            'instructor__branch', 'facility'
+        )
+
+    def validate(self, data):
+        # PARTIAL UPDATES COMPARE AGAINST THE STORED TIME THEY LEAVE UNCHANGED
+        start_time = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = data.get('end_time', getattr(self.instance, 'end_time', None))
+        if start_time and end_time and start_time >= end_time:
+            raise serializers.ValidationError({'end_time': "End time must be after start time."})
+
+        return data
+
     def get_instructor_name(self, obj):
         instructor = obj.instructor
         if instructor and instructor.branch:
@@ -30,17 +57,37 @@ class SessionSerializer(serializers.ModelSerializer):
         return instructor.first_name if instructor else None
 
     def get_facility_name(self, obj):
-        facility_model_map = {
-            'Vehicle': Vehicle,
-            'Classroom': Classroom
-        }
-        
-        if obj.facility:
-            model = facility_model_map.get(obj.facility.facility_type)
-            if model:
-                try:
-                    facility_instance = model.objects.get(pk=obj.facility.object_id)
-                    return str(facility_instance)
-                except model.DoesNotExist:
-                    return None
-        return None
+        if not obj.facility:
+            return None
+
+        facility_names = getattr(self, 'facility_names', None)
+        if facility_names is None or obj.facility.id not in facility_names:
+            facility_names = Facility.resolve_display_names([obj.facility])
+        return facility_names.get(obj.facility.id)
+
+
+class SessionBatchItemSerializer(serializers.Serializer):
+    REQUIRED_ON_CREATE = ['session_date', 'start_time', 'end_time', 'enrollment', 'instructor', 'facility']
+
+    session_id = serializers.IntegerField(required=False)
+    session_nth = serializers.CharField(max_length=5, required=False, validators=Session._meta.get_field('session_nth').validators)
+    session_date = serializers.DateField(required=False)
+    start_time = serializers.TimeField(required=False)
+    end_time = serializers.TimeField(required=False)
+    enrollment = serializers.IntegerField(required=False)
+    instructor = serializers.CharField(max_length=10, required=False)
+    facility = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Session.STATUS_CHOICES, required=False)
+
+    def validate(self, data):
+        if 'session_id' not in data:
+            missing_fields = [field for field in self.REQUIRED_ON_CREATE if field not in data]
+            if missing_fields:
+                raise serializers.ValidationError({field: "This field is required." for field in missing_fields})
+
+        start_time = data.get('start_time')
+        end_time = data.get('end_time')
+        if start_time and end_time and start_time >= end_time:
+            raise serializers.ValidationError({'end_time': "End time must be after start time."})
+
+        return data
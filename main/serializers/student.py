@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from ..models import Student, Enrollment, Session
+from django.db.models import Prefetch
+from ..models import Student, Enrollment
 
 
 class StudentSerializer(serializers.ModelSerializer):
@@ -11,34 +12,24 @@ class StudentSerializer(serializers.ModelSerializer):
         model = Student
         fields = ['student_code', 'first_name', 'last_name', 'address', 'contact_number', 'emergency_number', 'email', 'is_active', 'year_joined', 'status', 'courses_enrolled']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('user').prefetch_related(
+            Prefetch(
+                'enrollment_set',
+                queryset=Enrollment.objects.select_related('course__course_category').with_session_progress().order_by('enrollment_id'),
+                to_attr='prefetched_enrollments'
+            )
+        )
+
     def get_courses_enrolled(self, obj):
-        enrollments = Enrollment.objects.filter(student=obj)
+        enrollments = getattr(obj, 'prefetched_enrollments', None)
+        if enrollments is None:
+            enrollments = Enrollment.objects.filter(student=obj).select_related('course__course_category').with_session_progress().order_by('enrollment_id')
+
         courses_data = []
         
         for enrollment in enrollments:
-            course_code = enrollment.course.course_code
-            course_category = enrollment.course.course_category.category_code
-            total_hours = enrollment.total_hours
-
-            if course_code == 'ASS':
-                total_sessions = 1
-            elif course_category in ['4W', '2W/3W', 'SDC']:
-                total_sessions = total_hours // 2
-            elif course_category == 'TDC':
-                total_sessions = int(total_hours // 7.5)
-            else:
-                total_sessions = 0
-                
-            scheduled_sessions = Session.objects.filter(
-                enrollment=enrollment,
-                status__in=['Scheduled', 'Completed']
-            ).count()
-
-            completed_sessions = Session.objects.filter(
-                enrollment=enrollment,
-                status='Completed'
-            ).count()
-            
             courses_data.append({
                 'course_code': enrollment.course.course_code, 
                 'course_name': enrollment.course.course_name,
@@ -46,9 +37,9 @@ class StudentSerializer(serializers.ModelSerializer):
                 'transmission_type': enrollment.transmission_type,
                 'course_category': enrollment.course.course_category.category_name,
                 'enrollment_status': enrollment.status,
-                'total_sessions': total_sessions,
-                'scheduled_sessions': scheduled_sessions,
-                'completed_sessions': completed_sessions,
+                'total_sessions': enrollment.total_sessions,
+                'scheduled_sessions': enrollment.scheduled_sessions,
+                'completed_sessions': enrollment.completed_sessions,
             })
         
         return courses_data
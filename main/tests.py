@@ -1,3 +1,90 @@
+from datetime import date, time
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.test import APIClient
+from .analytics_cache import analytics_cache
+from .models import Branch, Course, CourseCategory, Enrollment, Facility, Instructor, Session, Student, Vehicle
 
-# Create your tests here.
+
+class AnalyticsCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for branch_name in ['Main', 'North', 'Northgate']:
+            Branch.objects.create(branch_name=branch_name, branch_address='Address', status='Open')
+
+        category = CourseCategory.objects.create(category_code='4W', category_name='Four Wheels', category_type='PDC')
+        course = Course.objects.create(course_code='PDC4', course_name='PDC 4W', course_category=category, course_description='')
+
+        cls.instructor = Instructor(first_name='Instructor', branch_id='North')
+        cls.instructor.save()
+        vehicle = Vehicle(wheel_num='4W', transmission_type='MT', vehicle_model='Vios', color='Red', manufacturer='Toyota', branch_id='North')
+        vehicle.save()
+        cls.facility = Facility.objects.get(object_id=vehicle.vehicle_code)
+
+        student = Student(first_name='Student', last_name='One')
+        student.save()
+        cls.enrollment = Enrollment.objects.create(branch_id='North', student=student, course=course, transmission_type='MT', total_hours=8)
+
+    def setUp(self):
+        analytics_cache().clear()
+        self.client = APIClient()
+
+    def get_stats(self, branch='North'):
+        return self.client.get('/api/sessions-over-time/', {'start_date': '2026-01-01', 'branch': branch})
+
+    def schedule_session(self):
+        Session(
+            session_nth='1', session_date=date(2026, 10, 21), start_time=time(8), end_time=time(10),
+            enrollment=self.enrollment, instructor=self.instructor, facility=self.facility, status='Scheduled',
+        ).save()
+
+    def test_repeated_request_hits_the_cache(self):
+        first = self.get_stats()
+        second = self.get_stats()
+
+        self.assertEqual(first['X-Analytics-Cache'], 'MISS')
+        self.assertEqual(second['X-Analytics-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+
+    def test_session_save_invalidates_after_commit(self):
+        self.assertEqual(self.get_stats().data['monthlyStats'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule_session()
+            # NOT BEFORE COMMIT, SO A READER CAN'T CACHE UNCOMMITTED DATA UNDER THE NEW VERSION
+            self.assertEqual(self.get_stats()['X-Analytics-Cache'], 'HIT')
+
+        response = self.get_stats()
+        self.assertEqual(response['X-Analytics-Cache'], 'MISS')
+        self.assertEqual(response.data['monthlyStats'][0]['count'], 1)
+
+    def test_enrollment_save_invalidates_after_commit(self):
+        self.get_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment.total_hours = 10
+            self.enrollment.save()
+
+        self.assertEqual(self.get_stats()['X-Analytics-Cache'], 'MISS')
+
+    def test_rollback_keeps_the_cache(self):
+        self.get_stats()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.schedule_session()
+                transaction.set_rollback(True)
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.get_stats()['X-Analytics-Cache'], 'HIT')
+
+    def test_branch_move_invalidates_both_branches(self):
+        self.get_stats('North')
+        self.get_stats('Northgate')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment.branch_id = 'Northgate'
+            self.enrollment.save()
+
+        self.assertEqual(self.get_stats('North')['X-Analytics-Cache'], 'MISS')
+        self.assertEqual(self.get_stats('Northgate')['X-Analytics-Cache'], 'MISS')
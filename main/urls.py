@@ -57,6 +57,8 @@ urlpatterns = [
     path('sessions/', views.SessionList.as_view(), name='session-list'),
     path('sessions/<str:session_id>/', views.SessionDetail.as_view(), name='session-detail'),
     path('student-sessions/<str:student_code>', views.StudentSessions.as_view(), name='student-sessions'),
+    path('bulk-sessions/', views.SessionBulkSchedule.as_view(), name='bulk-sessions'),
+    path('session-timeline/', views.SessionTimeline.as_view(), name='session-timeline'),
 
     # Analytics
     path('enrollment-trends/', views.EnrollmentTrends.as_view(), name='enrollment-trends'),
@@ -66,7 +68,11 @@ urlpatterns = [
     path('classroom-utilization/', views.ClassroomUtilization.as_view(), name='classroom-utilization'),
     path('instructor-utilization/', views.InstructorUtilization.as_view(), name='instructor-utilization'),
     path('vehicle-utilization/', views.VehicleUtilization.as_view(), name='vehicle-utilization'),
+    path('analytics-cache-stats/', views.AnalyticsCacheStats.as_view(), name='analytics-cache-stats'),
     path('schedule-recommendation/', views.ScheduleRecommendation.as_view(), name='schedule-recommendation'),
+    path('batch-schedule-recommendation/', views.BatchScheduleRecommendation.as_view(), name='batch-schedule-recommendation'),
+    path('auto-schedule/', views.AutoSchedule.as_view(), name='auto-schedule'),
+    path('slot-search/', views.SlotSearch.as_view(), name='slot-search'),
     path('tdc-schedule-list/', views.TdcScheduleList.as_view(), name='tdc-schedule-list'),
     path('tdc-schedule-match/', views.TdcScheduleMatch.as_view(), name='tdc-schedule-match'),
 
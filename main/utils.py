@@ -0,0 +1,32 @@
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Cast, Ceil
+import math
+
+# HOURS PER SESSION BY COURSE CATEGORY TYPE; SINGLE-SESSION COURSES ARE ONE SESSION REGARDLESS OF HOURS
+SESSION_HOURS = {'PDC': 2, 'TDC': 7.5}
+SINGLE_SESSION_COURSES = ['ASS']
+
+
+def calculate_total_sessions(course_code, category_type, total_hours):
+    if course_code in SINGLE_SESSION_COURSES:
+        return 1
+    if category_type in SESSION_HOURS:
+        return math.ceil(total_hours / SESSION_HOURS[category_type])
+    return 0
+
+
+def total_sessions_expression(prefix=''):
+    # SAME RULE AS calculate_total_sessions, BUILT FROM THE SAME TABLE AND EVALUATED BY THE DATABASE FOR A WHOLE QUERYSET
+    total_hours = Cast(F(f'{prefix}total_hours'), FloatField())
+    return Case(
+        When(**{f'{prefix}course__course_code__in': SINGLE_SESSION_COURSES}, then=Value(1)),
+        *[
+            When(
+                **{f'{prefix}course__course_category__category_type': category_type},
+                then=Cast(Ceil(total_hours / hours), IntegerField())
+            )
+            for category_type, hours in SESSION_HOURS.items()
+        ],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
@@ -1,4 +1,4 @@
-from .analytics import EnrollmentTrends, MonthlyAndDailyStats, SessionTrends, ResourceStats, ClassroomUtilization, InstructorUtilization, VehicleUtilization, ScheduleRecommendation, TdcScheduleList, TdcScheduleMatch
+from .analytics import EnrollmentTrends, MonthlyAndDailyStats, SessionTrends, ResourceStats, ClassroomUtilization, InstructorUtilization, VehicleUtilization, ScheduleRecommendation, BatchScheduleRecommendation, AutoSchedule, SlotSearch, TdcScheduleList, TdcScheduleMatch, AnalyticsCacheStats
 from .branch import BranchList, BranchDetail, ValidBranchList
 from .classroom import ClassroomList, ClassroomDetail
 from .course_category import CourseCategoryList, CourseCategoryDetail
@@ -8,5 +8,5 @@ from .instructor import InstructorList, InstructorDetail, CreateInstructor, Inst
 from .vehicle import VehicleList, VehicleDetail
 from .student import StudentList, StudentDetail, EnrollStudent, StudentEnrollments
 from .enrollment import EnrollmentList, EnrollmentDetail, StudentEnrollmentList
-from .session import SessionList, SessionDetail, StudentSessions
+from .session import SessionList, SessionDetail, StudentSessions, SessionBulkSchedule, SessionTimeline
 from .user import RegisterView, LoginView, LogoutView, UserList, UserDetail, ConfirmPasswordView, ChangePasswordView
\ No newline at end of file
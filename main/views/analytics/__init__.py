@@ -1,4 +1,7 @@
 from .recommendation.schedule_recommendation import ScheduleRecommendation
+from .recommendation.batch_schedule_recommendation import BatchScheduleRecommendation
+from .recommendation.auto_schedule import AutoSchedule
+from .recommendation.slot_search import SlotSearch
 from .recommendation.tdc_schedule_list import TdcScheduleList
 from .recommendation.tdc_match import TdcScheduleMatch
 from .recommendation.instructor_recommendation import get_available_instructors, get_recommended_instructors
@@ -8,4 +11,5 @@ from .reports.instructor import InstructorUtilization
 from .reports.vehicle import VehicleUtilization
 from .stats.enrollment import EnrollmentTrends
 from .stats.resource import ResourceStats
-from .stats.session import MonthlyAndDailyStats, SessionTrends
\ No newline at end of file
+from .stats.session import MonthlyAndDailyStats, SessionTrends
+from .stats.cache import AnalyticsCacheStats
\ No newline at end of file
@@ -0,0 +1,70 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from datetime import datetime, timedelta
+import math
+import time
+from ....auto_scheduler import load_scheduler, save_proposals
+
+
+class AutoSchedule(APIView):
+    DEFAULT_HORIZON_DAYS = 14
+    MAX_TIME_BUDGET = 60.0
+
+    def post(self, request):
+        branch = request.data.get('branch')
+        if not branch:
+            return Response({'branch': "branch is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start_date = self.parse_date(request.data.get('start_date')) or datetime.now().date() + timedelta(days=1)
+            end_date = self.parse_date(request.data.get('end_date')) or start_date + timedelta(days=self.DEFAULT_HORIZON_DAYS - 1)
+        except ValueError:
+            return Response({"error": "Invalid date format. Please use yyyy-mm-dd."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            time_budget = float(request.data.get('time_budget', 10))
+        except (TypeError, ValueError):
+            time_budget = None
+        if time_budget is None or not math.isfinite(time_budget) or time_budget <= 0:
+            return Response({"time_budget": "time_budget must be a positive number of seconds."}, status=status.HTTP_400_BAD_REQUEST)
+        time_budget = min(time_budget, self.MAX_TIME_BUDGET)
+
+        if end_date < start_date:
+            return Response({"error": "end_date must not be before start_date."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # DRY RUN UNLESS EXPLICITLY TURNED OFF, SINCE A RUN CAN CREATE HUNDREDS OF SESSIONS
+        dry_run = str(request.data.get('dry_run', True)).lower() not in ('false', '0', 'no')
+
+        started = time.perf_counter()
+        scheduler = load_scheduler(branch, start_date, end_date, time_budget)
+        proposals, unscheduled = scheduler.run()
+
+        data = {
+            'dryRun': dry_run,
+            'startDate': start_date,
+            'endDate': end_date,
+            'scheduled': [
+                {
+                    'enrollmentId': proposal.enrollment.enrollment_id,
+                    'sessionNth': proposal.session_nth,
+                    'sessionDate': proposal.session_date,
+                    'startTime': proposal.start_time,
+                    'endTime': proposal.end_time,
+                    'instructorCode': proposal.instructor.code,
+                    'facilityCode': proposal.facility.code,
+                    'facilityId': proposal.facility.facility_id,
+                }
+                for proposal in sorted(scheduler.proposals, key=lambda proposal: (proposal.session_date, proposal.start_time, proposal.enrollment.enrollment_id))
+            ],
+            'unscheduled': unscheduled,
+        }
+
+        if not dry_run:
+            save_proposals(proposals)
+
+        data['elapsed'] = round(time.perf_counter() - started, 3)
+        return Response(data, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+    def parse_date(self, value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
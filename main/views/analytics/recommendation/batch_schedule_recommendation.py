@@ -0,0 +1,150 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from math import ceil
+from ....models import Enrollment
+from ....availability import parse_time_window, get_booked_sessions, get_busy_resources
+from ..utils import calculate_date_range, get_facility_hours, get_instructor_hours
+from .instructor_recommendation import get_month_range, rank_instructors
+from .vehicle_recommendation import rank_vehicles
+from .classroom_recommendation import rank_classrooms
+from .resource_catalog import list_instructors, list_vehicles, list_classrooms, rank_by_utilization
+
+
+class BatchScheduleRecommendation(APIView):
+    FACILITIES = {
+        'PDC': ('Vehicle', 'vehicles', 'vehicleCode'),
+        'TDC': ('Classroom', 'classrooms', 'classroomCode'),
+    }
+
+    def post(self, request):
+        if not isinstance(request.data, dict):
+            return Response({'error': 'A JSON object with enrollment_id is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        enrollment_id = request.data.get('enrollment_id')
+        if not enrollment_id:
+            return Response({'enrollment_id': "enrollment_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            enrollment = Enrollment.objects.select_related('course__course_category').get(pk=enrollment_id)
+        except (Enrollment.DoesNotExist, ValueError):
+            return Response({'error': "Enrollment not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        category = enrollment.course.course_category.category_type
+        if category not in self.FACILITIES:
+            return Response({"message": "Invalid course category."}, status=status.HTTP_400_BAD_REQUEST)
+
+        slots, errors = self.parse_slots(request.data, enrollment)
+        if any(errors):
+            return Response({'error': 'Invalid slots.', 'slots': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        recommendations = self.recommend(
+            slots,
+            category=category,
+            wheel_num=enrollment.course.course_category.category_code,
+            transmission_type=enrollment.transmission_type,
+            branch=request.data.get('branch') or enrollment.branch_id,
+            last_session=ceil(enrollment.total_hours / 2),
+        )
+        return Response({'enrollmentId': enrollment.pk, 'slots': recommendations}, status=status.HTTP_200_OK)
+
+    def parse_slots(self, data, enrollment):
+        # EXPLICIT CANDIDATE SLOTS, OR ONE SLOT PER PREFERRED DATE AT THE REQUESTED TIME
+        items = data.get('slots')
+        if not items:
+            items = [
+                {'session_date': str(preferred_date), 'start_time': data.get('start_time'), 'end_time': data.get('end_time')}
+                for preferred_date in sorted(enrollment.preferred_dates)
+            ]
+            if not items:
+                return [], [{'slots': "Provide slots or set the enrollment's preferred dates."}]
+
+        slots = []
+        errors = []
+        for item in items:
+            try:
+                session_date, start_time, end_time = parse_time_window(item['session_date'], item['start_time'], item['end_time'])
+                session_nth = int(item['session_nth']) if item.get('session_nth') else None
+            except (KeyError, TypeError, ValueError):
+                slots.append(None)
+                errors.append({'slot': "Each slot needs session_date (yyyy-mm-dd), start_time and end_time (HH:MM)."})
+                continue
+
+            if start_time >= end_time:
+                slots.append(None)
+                errors.append({'end_time': "End time must be after start time."})
+                continue
+
+            slots.append({'sessionNth': session_nth, 'sessionDate': session_date, 'startTime': start_time, 'endTime': end_time})
+            errors.append({})
+
+        # NUMBER UNSPECIFIED SLOTS AFTER THE SESSIONS ALREADY SCHEDULED OR COMPLETED
+        next_nth = enrollment.scheduled_count + enrollment.completed_count + 1
+        for slot in sorted(filter(None, slots), key=lambda slot: (slot['sessionDate'], slot['startTime'])):
+            if slot['sessionNth'] is None:
+                slot['sessionNth'] = next_nth
+                next_nth += 1
+            else:
+                next_nth = max(next_nth, slot['sessionNth'] + 1)
+
+        return slots, errors
+
+    def recommend(self, slots, category, wheel_num, transmission_type, branch, last_session):
+        facility_type, facility_key, facility_code = self.FACILITIES[category]
+
+        # LOAD AVAILABILITY AND RESOURCES ONCE FOR THE WHOLE BATCH
+        booked = get_booked_sessions({slot['sessionDate'] for slot in slots})
+        instructors = list_instructors()
+        facilities = list_vehicles() if facility_type == 'Vehicle' else list_classrooms()
+
+        # SAME WINDOWS AS THE SINGLE-SLOT VIEW: THE WHOLE MONTH FOR INSTRUCTORS, MONTH START TO THE SESSION DATE FOR FACILITIES
+        instructor_catalogs = {}
+        facility_catalogs = {}
+        def ranked_catalogs(session_date):
+            month_range = get_month_range(session_date)
+            if month_range not in instructor_catalogs:
+                instructor_catalogs[month_range] = rank_by_utilization(instructors, get_instructor_hours(*month_range))
+
+            facility_range = calculate_date_range(end_date=session_date)
+            if facility_range not in facility_catalogs:
+                facility_catalogs[facility_range] = rank_by_utilization(facilities, get_facility_hours(facility_type, *facility_range))
+
+            return instructor_catalogs[month_range], facility_catalogs[facility_range]
+
+        recommendations = [None] * len(slots)
+        for index, slot in sorted(enumerate(slots), key=lambda entry: (entry[1]['sessionDate'], entry[1]['startTime'])):
+            day_sessions = booked.setdefault(slot['sessionDate'], [])
+            busy_instructors, busy_facilities = get_busy_resources(day_sessions, slot['startTime'], slot['endTime'])
+            instructor_catalog, facility_catalog = ranked_catalogs(slot['sessionDate'])
+
+            available_instructors = [
+                instructor for instructor in instructor_catalog
+                if instructor.code not in busy_instructors
+            ]
+            available_facilities = [
+                facility for facility in facility_catalog
+                if facility.code not in busy_facilities.get(facility_type, set())
+            ]
+
+            recommended_instructors = rank_instructors(available_instructors, category, branch, slot['sessionNth'], last_session)
+            if facility_type == 'Vehicle':
+                recommended_facilities = rank_vehicles(available_facilities, wheel_num, transmission_type, branch)
+            else:
+                recommended_facilities = rank_classrooms(available_facilities, branch)
+
+            # HOLD THE PROPOSED INSTRUCTOR AND FACILITY SO OVERLAPPING SLOTS GET DIFFERENT ONES
+            day_sessions.append({
+                'start_time': slot['startTime'],
+                'end_time': slot['endTime'],
+                'instructor_id': recommended_instructors[0]['instructorCode'] if recommended_instructors else None,
+                'facility_type': facility_type,
+                'facility__object_id': recommended_facilities[0][facility_code] if recommended_facilities else None,
+            })
+
+            recommendations[index] = {
+                **slot,
+                facility_key: recommended_facilities,
+                'instructors': recommended_instructors,
+            }
+
+        return recommendations
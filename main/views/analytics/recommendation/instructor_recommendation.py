@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
-from ....models import Session
-from ..utils import get_instructor_utilization
+from ....availability import get_busy_instructors
+from .resource_catalog import ResourceIndex, get_instructor_catalog
 
 
 def get_month_range(session_date):
@@ -21,21 +21,13 @@ def get_available_instructors(session_date, start_time, end_time):
         session_date = datetime.strptime(session_date, '%Y-%m-%d')
 
     # GET BUSY INSTRUCTORS
-    busy_instructors = Session.objects.filter(
-        session_date=session_date,
-        start_time__lt=end_time,
-        end_time__gt=start_time,
-        status__in=['Completed', 'Scheduled']
-    ).exclude(instructor__status='Archived').values_list('instructor__instructor_code', flat=True)
+    busy_instructors = get_busy_instructors(session_date, start_time, end_time)
 
-    # GET UTILIZATION DATA FOR THE ENTIRE MONTH
+    # FETCH ACTIVE INSTRUCTORS, LEAST UTILIZED THIS MONTH FIRST
     month_start, month_end = get_month_range(session_date)
-    instructor_data = get_instructor_utilization(start_date=month_start, end_date=month_end)
-
-    # FILTER AVAILABLE INSTRUCTORS
     available_instructors = [
-        instructor for instructor in instructor_data.get('instructors', [])
-        if instructor['instructorCode'] not in busy_instructors
+        instructor for instructor in get_instructor_catalog(month_start, month_end)
+        if instructor.code not in busy_instructors
     ]
 
     return available_instructors
@@ -44,38 +36,11 @@ def get_available_instructors(session_date, start_time, end_time):
 def get_recommended_instructors(category, session_date, start_time, end_time, branch, session_nth, last_session):
     # GET AVAILABLE INSTRUCTORS FOR THE GIVEN DATE AND TIME
     available_instructors = get_available_instructors(session_date, start_time, end_time)
+    return rank_instructors(available_instructors, category, branch, session_nth, last_session)
 
-    # SEPARATE INSTRUCTORS BY SENIOR AND REGULAR
-    senior_instructors = []
-    remaining_instructors = []
-    recommended_instructors = []
-    
-    for instructor in available_instructors:
-        instructor_info = {
-            'instructorCode': instructor['instructorCode'],
-            'instructorName': instructor['instructorName'],
-            'branchName': instructor['instructorName'].split(" / ")[-1]
-        }
-        recommended_instructors.append(instructor_info)
-        if "SR" in instructor['instructorName']:
-            senior_instructors.append(instructor_info)
-        else:
-            remaining_instructors.append(instructor_info)
-
-    # PRIORITIZE SENIOR INSTRUCTORS IF FIRST OR LAST SESSION
-    if (category == 'PDC') and (session_nth == 1 or session_nth == last_session):
-        recommended_instructors = []
-        recommended_instructors = senior_instructors + remaining_instructors
-
-    # FILTER INSTRUCTORS FROM SPECIFIED BRANCH
-    branch_instructors = [instructor for instructor in recommended_instructors if instructor['branchName'] == branch]
-    
-    # FALLBACK TO MAIN BRANCH IF NO INSTRUCTORS FOUND FOR SPECIFIED BRANCH
-    if not branch_instructors:
-        branch_instructors = [instructor for instructor in recommended_instructors if instructor['branchName'] == 'Main']
-
-    # CONSOLIDATE LIST OF INSTRUCTORS, PRIORITIZING THOSE FROM SPECIFIED BRANCH
-    other_instructors = [instructor for instructor in recommended_instructors if instructor not in branch_instructors]
-    final_instructors = branch_instructors + other_instructors
 
-    return final_instructors
\ No newline at end of file
+def rank_instructors(available_instructors, category, branch, session_nth, last_session):
+    # BRANCH (OR MAIN) FIRST, SENIORS FIRST FOR THE FIRST OR LAST PDC SESSION, THEN LEAST UTILIZED
+    senior_first = category == 'PDC' and session_nth in (1, last_session)
+    ranked = ResourceIndex(available_instructors).ranked(branch, senior_first=senior_first)
+    return [instructor.to_response() for instructor in ranked]
@@ -0,0 +1,148 @@
+from django.db.models import OuterRef, Subquery
+from django.contrib.contenttypes.models import ContentType
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from ....models import Instructor, Vehicle, Classroom, Facility
+from ..utils import calculate_date_range, get_facility_hours, get_instructor_hours
+
+
+def facility_id_subquery(model, code_field):
+    return Subquery(
+        Facility.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=OuterRef(code_field)
+        ).values('id')[:1]
+    )
+
+
+@dataclass(frozen=True)
+class InstructorRecord:
+    code: str
+    name: str
+    branch: str
+    is_senior: bool
+    hours_assigned: float = 0.0
+
+    def to_response(self):
+        return {'instructorCode': self.code, 'instructorName': self.name, 'branchName': self.branch}
+
+
+@dataclass(frozen=True)
+class VehicleRecord:
+    code: str
+    name: str
+    branch: str
+    facility_id: int
+    wheel_num: str
+    transmission_type: str
+    hours_assigned: float = 0.0
+
+    def to_response(self):
+        return {'vehicleCode': self.code, 'vehicleName': self.name, 'facilityId': self.facility_id}
+
+
+@dataclass(frozen=True)
+class ClassroomRecord:
+    code: str
+    name: str
+    branch: str
+    facility_id: int
+    capacity: int
+    hours_assigned: float = 0.0
+
+    def to_response(self):
+        return {'classroomCode': self.code, 'classroomName': self.name, 'facilityId': self.facility_id}
+
+
+class ResourceIndex:
+    # ONE PASS OVER THE RECORDS, THEN CONSTANT-TIME LOOKUPS BY BRANCH AND SENIORITY
+    def __init__(self, records):
+        self.records = list(records)
+        self.by_branch = defaultdict(list)
+        for record in self.records:
+            self.by_branch[record.branch].append(record)
+        self.senior_codes = {record.code for record in self.records if getattr(record, 'is_senior', False)}
+
+    def preferred_branch(self, branch):
+        # THE REQUESTED BRANCH, FALLING BACK TO MAIN WHEN IT HAS NO RECORDS
+        return branch if branch in self.by_branch else 'Main'
+
+    def ranked(self, branch, senior_first=False):
+        branch = self.preferred_branch(branch)
+        return sorted(self.records, key=lambda record: (
+            record.branch != branch,
+            senior_first and record.code not in self.senior_codes,
+            record.hours_assigned,
+            record.code,
+        ))
+
+
+def rank_by_utilization(resources, hours_assigned):
+    # LEAST UTILIZED FIRST, USING THE HOURS ALREADY ROLLED UP FOR THE PERIOD
+    ranked = [replace(resource, hours_assigned=hours_assigned.get(resource.code, 0.0)) for resource in resources]
+    return sorted(ranked, key=lambda resource: (resource.hours_assigned, resource.code))
+
+
+def list_instructors():
+    instructors = Instructor.objects.exclude(status__in=['Archived', 'Inactive', 'On Leave']).values(
+        'instructor_code', 'first_name', 'is_senior', 'branch_id'
+    )
+
+    return [
+        InstructorRecord(
+            code=instructor['instructor_code'],
+            name=f"{instructor['first_name']}{' SR' if instructor['is_senior'] else ''} / {instructor['branch_id']}",
+            branch=instructor['branch_id'],
+            is_senior=instructor['is_senior'],
+        )
+        for instructor in instructors
+    ]
+
+
+def list_vehicles():
+    vehicles = Vehicle.objects.exclude(status__in=['Archived', 'Unavailable']).annotate(
+        facility_id=facility_id_subquery(Vehicle, 'vehicle_code')
+    ).filter(facility_id__isnull=False).values('vehicle_code', 'vehicle_model', 'color', 'transmission_type', 'wheel_num', 'branch_id', 'facility_id')
+
+    return [
+        VehicleRecord(
+            code=vehicle['vehicle_code'],
+            name=f"{vehicle['vehicle_model']} {vehicle['transmission_type']} {vehicle['color']} / {vehicle['branch_id']}",
+            branch=vehicle['branch_id'],
+            facility_id=vehicle['facility_id'],
+            wheel_num=vehicle['wheel_num'],
+            transmission_type=vehicle['transmission_type'],
+        )
+        for vehicle in vehicles
+    ]
+
+
+def list_classrooms():
+    classrooms = Classroom.objects.exclude(status__in=['Archived', 'Unavailable']).annotate(
+        facility_id=facility_id_subquery(Classroom, 'classroom_code')
+    ).filter(facility_id__isnull=False).values('classroom_code', 'capacity', 'branch_id', 'facility_id')
+
+    return [
+        ClassroomRecord(
+            code=classroom['classroom_code'],
+            name=f"{classroom['classroom_code']} / {classroom['branch_id']}",
+            branch=classroom['branch_id'],
+            facility_id=classroom['facility_id'],
+            capacity=classroom['capacity'],
+        )
+        for classroom in classrooms
+    ]
+
+
+def get_instructor_catalog(month_start, month_end):
+    return rank_by_utilization(list_instructors(), get_instructor_hours(month_start, month_end))
+
+
+def get_vehicle_catalog(end_date):
+    start_date, end_date = calculate_date_range(end_date=end_date)
+    return rank_by_utilization(list_vehicles(), get_facility_hours('Vehicle', start_date, end_date))
+
+
+def get_classroom_catalog(end_date):
+    start_date, end_date = calculate_date_range(end_date=end_date)
+    return rank_by_utilization(list_classrooms(), get_facility_hours('Classroom', start_date, end_date))
@@ -32,7 +32,7 @@ class ScheduleRecommendation(APIView):
             enrollment = Enrollment.objects.select_related('branch', 'course', 'course__course_category').get(pk=enrollment_id)
             wheel_num = enrollment.course.course_category.category_code
             transmission_type = enrollment.transmission_type
-            branch = branch or enrollment.branch
+            branch = branch or enrollment.branch_id
             total_hours = enrollment.total_hours
             last_session = ceil(total_hours / 2)
             category = enrollment.course.course_category.category_type
@@ -0,0 +1,175 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from ....models import Session
+from ....availability import ACTIVE_STATUSES, to_minutes, free_intervals, union_intervals, intersect_intervals
+from .resource_catalog import ResourceIndex, list_instructors, list_vehicles, list_classrooms
+
+SUNDAY = 6
+
+
+class SlotSearch(APIView):
+    FACILITIES = {
+        'Vehicle': ('vehicles', list_vehicles),
+        'Classroom': ('classrooms', list_classrooms),
+    }
+    MAX_COUNT = 50
+
+    def get(self, request):
+        try:
+            params = self.validate_and_extract_params(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        instructors, facilities = self.fetch_resources(params)
+        busy = self.fetch_busy_intervals(params, instructors, facilities)
+        windows = self.find_windows(params, instructors, facilities, busy)
+
+        facility_key = self.FACILITIES[params['facility_type']][0]
+        return Response({
+            'duration': params['duration'],
+            'windows': [
+                {
+                    'sessionDate': session_date,
+                    'startTime': self.to_time(start),
+                    'endTime': self.to_time(start + params['duration']),
+                    'instructors': [instructor.to_response() for instructor in free_instructors],
+                    facility_key: [facility.to_response() for facility in free_facilities],
+                }
+                for session_date, start, free_instructors, free_facilities in windows
+            ],
+        }, status=status.HTTP_200_OK)
+
+    def validate_and_extract_params(self, query_params):
+        facility_type = query_params.get('facility_type', 'Vehicle')
+        if facility_type not in self.FACILITIES:
+            raise ValueError("facility_type must be Vehicle or Classroom.")
+
+        try:
+            start_date = query_params.get('start_date')
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else datetime.now().date() + timedelta(days=1)
+            end_date = query_params.get('end_date')
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else start_date + timedelta(days=13)
+            day_start = to_minutes(datetime.strptime(query_params.get('day_start', '08:00'), '%H:%M'))
+            day_end = to_minutes(datetime.strptime(query_params.get('day_end', '17:00'), '%H:%M'))
+        except ValueError:
+            raise ValueError("Invalid date or time format. Use yyyy-mm-dd for dates and HH:MM for times.")
+
+        try:
+            duration = int(query_params.get('duration', 120))
+            count = min(int(query_params.get('count', 5)), self.MAX_COUNT)
+            step = int(query_params.get('step', 30))
+            min_capacity = int(query_params.get('min_capacity', 0))
+        except ValueError:
+            raise ValueError("duration, count, step and min_capacity must be whole numbers.")
+
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date.")
+        if duration <= 0 or count <= 0 or step <= 0:
+            raise ValueError("duration, count and step must be positive.")
+
+        return {
+            'facility_type': facility_type,
+            'branch': query_params.get('branch'),
+            'wheel_num': query_params.get('wheel_num'),
+            'transmission_type': query_params.get('transmission_type'),
+            'senior': str(query_params.get('senior', '')).lower() in ('true', '1', 'yes'),
+            'min_capacity': min_capacity,
+            'duration': duration,
+            'count': count,
+            'step': step,
+            'start_date': start_date,
+            'end_date': end_date,
+            'day_start': day_start,
+            'day_end': day_end,
+        }
+
+    def fetch_resources(self, params):
+        # ACTIVE RESOURCES MATCHING EVERY GIVEN CONSTRAINT
+        instructors = [
+            instructor for instructor in list_instructors()
+            if params['branch'] in (None, instructor.branch) and (instructor.is_senior or not params['senior'])
+        ]
+
+        facilities = [
+            facility for facility in self.FACILITIES[params['facility_type']][1]()
+            if params['branch'] in (None, facility.branch)
+        ]
+        if params['facility_type'] == 'Vehicle':
+            facilities = [
+                vehicle for vehicle in facilities
+                if params['wheel_num'] in (None, vehicle.wheel_num) and params['transmission_type'] in (None, vehicle.transmission_type)
+            ]
+        else:
+            facilities = [classroom for classroom in facilities if classroom.capacity >= params['min_capacity']]
+
+        return ResourceIndex(instructors).ranked(params['branch']), ResourceIndex(facilities).ranked(params['branch'])
+
+    def fetch_busy_intervals(self, params, instructors, facilities):
+        # BUSY MINUTES PER (RESOURCE CODE, DATE) FROM ONE QUERY OVER THE HORIZON
+        sessions = Session.objects.filter(
+            session_date__range=[params['start_date'], params['end_date']],
+            status__in=ACTIVE_STATUSES,
+        ).values_list('session_date', 'start_time', 'end_time', 'instructor_id', 'facility_type', 'facility__object_id')
+
+        instructor_codes = {instructor.code for instructor in instructors}
+        facility_codes = {facility.code for facility in facilities}
+
+        busy = defaultdict(list)
+        for session_date, start_time, end_time, instructor_code, facility_type, facility_code in sessions:
+            interval = (to_minutes(start_time), to_minutes(end_time))
+            if instructor_code in instructor_codes:
+                busy[(instructor_code, session_date)].append(interval)
+            if facility_type == params['facility_type'] and facility_code in facility_codes:
+                busy[(facility_code, session_date)].append(interval)
+        return busy
+
+    def feasible_starts(self, params, resources, busy, session_date):
+        # PER RESOURCE, THE CLOSED RANGE OF START MINUTES THAT FIT THE DURATION IN A FREE GAP
+        feasible = {}
+        for resource in resources:
+            gaps = free_intervals(busy[(resource.code, session_date)], params['day_start'], params['day_end'])
+            feasible[resource.code] = [(start, end - params['duration']) for start, end in gaps if end - start >= params['duration']]
+        return feasible
+
+    def find_windows(self, params, instructors, facilities, busy):
+        windows = []
+        session_date = params['start_date']
+        while session_date <= params['end_date'] and len(windows) < params['count']:
+            if session_date.weekday() != SUNDAY:
+                instructor_starts = self.feasible_starts(params, instructors, busy, session_date)
+                facility_starts = self.feasible_starts(params, facilities, busy, session_date)
+
+                # START TIMES WHERE SOME INSTRUCTOR AND SOME FACILITY ARE BOTH FREE FOR THE WHOLE DURATION
+                common = intersect_intervals(
+                    union_intervals(interval for intervals in instructor_starts.values() for interval in intervals),
+                    union_intervals(interval for intervals in facility_starts.values() for interval in intervals),
+                )
+
+                for start in self.candidate_starts(common, params['step']):
+                    windows.append((
+                        session_date,
+                        start,
+                        [instructor for instructor in instructors if self.contains(instructor_starts[instructor.code], start)],
+                        [facility for facility in facilities if self.contains(facility_starts[facility.code], start)],
+                    ))
+                    if len(windows) == params['count']:
+                        break
+            session_date += timedelta(days=1)
+        return windows
+
+    def candidate_starts(self, intervals, step):
+        # THE EARLIEST START OF EACH RANGE, THEN STARTS ALIGNED TO THE STEP
+        for start, end in intervals:
+            minute = start
+            while minute <= end:
+                yield minute
+                minute = (minute // step + 1) * step
+
+    def contains(self, intervals, minute):
+        return any(start <= minute <= end for start, end in intervals)
+
+    def to_time(self, minutes):
+        return time(minutes // 60, minutes % 60) if minutes < 24 * 60 else time(23, 59)
@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from collections import defaultdict
 from datetime import datetime
 from .tdc_schedule_list import TdcScheduleList
 import json
@@ -54,32 +55,8 @@ class TdcScheduleMatch(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        # CALL TdcScheduleRecommendation TO GET RECOMMENDED SCHEDULES
-        recommendation_request = {
-            'branch': branch,
-            'session_nth': session_nth,
-            'preferred_dates': None
-        }
-        recommendation_view = TdcScheduleList()
-        recommendation_response = recommendation_view.get(request=type('Request', (object,), {"query_params": recommendation_request}))
-
-        if recommendation_response.status_code != 200:
-            return Response(
-                {"error": "Failed to fetch recommendations."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-        
-        recommended_schedules = recommendation_response.data
-
-        # CHECK IF ANY RECOMMENDED SCHEDULE MATCHES THE PROVIDED DETAILS
-        matching_schedules = []
-        for schedule in recommended_schedules:
-            formatted_session_date = schedule['sessionDate'].strftime('%Y-%m-%d')
-            formatted_start_time = schedule['startTime'].strftime('%H:%M:%S')
-            formatted_end_time = schedule['endTime'].strftime('%H:%M:%S')
-
-            if formatted_session_date == str(session_date) and formatted_start_time == str(start_time) and formatted_end_time == str(end_time):
-                matching_schedules.append(schedule)
+        # LOOK UP OPEN CLASSES FOR THIS SLOT ONLY
+        matching_schedules = self.match_slots(branch, session_nth, [(session_date, start_time, end_time)])[0]
 
         # PREPARE RESPONSE
         response_data = {
@@ -88,3 +65,65 @@ class TdcScheduleMatch(APIView):
         }
 
         return Response(response_data, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        # VALIDATE MANY CANDIDATE SLOTS AT ONCE
+        required_fields = ['session_nth', 'branch', 'slots']
+        missing_fields = [field for field in required_fields if not request.data.get(field)]
+        if missing_fields:
+            return Response(
+                {field: f"{field} is required." for field in missing_fields},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            session_nth = int(request.data['session_nth'])
+        except (TypeError, ValueError):
+            return Response({"session_nth": "session_nth must be a whole number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        branch = request.data['branch']
+        if not isinstance(branch, str):
+            return Response({"branch": "branch must be a branch name."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(request.data['slots'], list):
+            return Response({"slots": "slots must be a list."}, status=status.HTTP_400_BAD_REQUEST)
+
+        slots = []
+        for slot in request.data['slots']:
+            try:
+                slots.append((
+                    datetime.strptime(slot['session_date'], "%Y-%m-%d").date(),
+                    datetime.strptime(slot['start_time'], "%H:%M").time(),
+                    datetime.strptime(slot['end_time'], "%H:%M").time(),
+                ))
+            except (KeyError, TypeError, ValueError):
+                return Response(
+                    {"error": "Each slot needs session_date (YYYY-MM-DD), start_time and end_time (HH:MM)."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        matches = self.match_slots(branch, session_nth, slots)
+
+        return Response({
+            "results": [
+                {
+                    "sessionDate": session_date,
+                    "startTime": start_time,
+                    "endTime": end_time,
+                    "matches": slot_matches,
+                    "hasMatch": bool(slot_matches),
+                }
+                for (session_date, start_time, end_time), slot_matches in zip(slots, matches)
+            ]
+        }, status=status.HTTP_200_OK)
+
+    def match_slots(self, branch, session_nth, slots):
+        # ONE QUERY FOR ALL SLOTS, THEN A DICTIONARY LOOKUP PER SLOT
+        schedule_list = TdcScheduleList()
+        offerings = schedule_list.fetch_offerings({'branch': branch, 'session_nth': session_nth, 'slots': slots})
+
+        schedules_by_slot = defaultdict(list)
+        for schedule in schedule_list.prepare_recommendations(offerings, []):
+            schedules_by_slot[(schedule['sessionDate'], schedule['startTime'], schedule['endTime'])].append(schedule)
+
+        return [schedules_by_slot.get(slot, []) for slot in slots]
@@ -1,10 +1,9 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django_pandas.io import read_frame
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import BooleanField, Case, F, Value, When
 from datetime import date
-from ....models import Session, Classroom, Facility
+from ....models import TdcOffering
 import json
 
 
@@ -15,11 +14,11 @@ class TdcScheduleList(APIView):
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # FETCH SESSIONS
-        sessions = self.fetch_sessions(params)
+        # FETCH OPEN CLASSES
+        offerings = self.fetch_offerings(params)
 
         # PREPARE SCHEDULE RECOMMENDATIONS
-        recommendations = self.prepare_recommendations(sessions, params['preferred_dates'])
+        recommendations = self.prepare_recommendations(offerings, params['preferred_dates'])
         return Response(recommendations, status=status.HTTP_200_OK)
 
     def validate_and_extract_params(self, query_params):
@@ -44,58 +43,58 @@ class TdcScheduleList(APIView):
             "preferred_dates": preferred_dates_list,
         }
 
-    def fetch_sessions(self, params):
-        return Session.objects.filter(
-            facility__facility_type='Classroom',
+    def fetch_offerings(self, params):
+        # OPEN TDC CLASSES WITH A STUDENT FROM THE BRANCH, READ FROM THE MAINTAINED OFFERINGS TABLE
+        offerings = TdcOffering.objects.filter(
             session_nth=params['session_nth'],
-            status='Scheduled',
             session_date__gte=date.today(),
-            enrollment__branch__branch_name=params['branch']
-        ).select_related('facility', 'instructor')
-
-    def prepare_recommendations(self, sessions, preferred_dates):
-        df = read_frame(
-            sessions,
-            fieldnames=['session_date', 'facility__object_id', 'instructor__first_name', 'instructor__instructor_code', 'start_time', 'end_time']
+            branches__contains=[params['branch']],
         )
 
-        # ADD CAPACITY, FACILITY ID, AND DURATION COLUMNS
-        capacity_info = df['facility__object_id'].apply(self.get_capacity)
-        df['capacity'] = capacity_info.apply(lambda x: x['capacity'])
-        df['facilityId'] = capacity_info.apply(lambda x: x['facilityId'])
-        df['duration'] = df.apply(lambda row: f"{row['start_time']} to {row['end_time']}", axis=1)
-
-        # RENAME COLUMNS
-        df.rename(columns={'session_date' : 'sessionDate', 'facility__object_id': 'classroom', 'instructor__first_name': 'instructor', 'instructor__instructor_code': 'instructorCode', 'start_time': 'startTime', 'end_time': 'endTime'}, inplace=True)
-        aggregated = (
-            df.groupby(['sessionDate', 'classroom', 'instructor', 'instructorCode', 'capacity', 'startTime', 'endTime', 'facilityId'])
-            .size()
-            .reset_index(name='scheduled')
+        # OPTIONALLY NARROW TO CANDIDATE (DATE, START, END) SLOTS THROUGH THE OFFERING TIME INDEX
+        if params.get('slots'):
+            offerings = offerings.filter(
+                session_date__in={slot[0] for slot in params['slots']},
+                start_time__in={slot[1] for slot in params['slots']},
+                end_time__in={slot[2] for slot in params['slots']},
+            )
+
+        return offerings.annotate(
+            availableSlots=F('classroom__capacity') - F('seats_taken'),
+        ).filter(
+            availableSlots__gt=0,
+        ).values(
+            'availableSlots',
+            sessionDate=F('session_date'),
+            classroom_code=F('classroom_id'),
+            instructor_name=F('instructor__first_name'),
+            instructorCode=F('instructor_id'),
+            capacity=F('classroom__capacity'),
+            startTime=F('start_time'),
+            endTime=F('end_time'),
+            facilityId=F('facility_id'),
+            scheduled=F('seats_taken'),
         )
 
-        # CREAYE AVAILABLE SLOTS AND PREFERRED DATE COLUMNS
-        aggregated['availableSlots'] = aggregated['capacity'] - aggregated['scheduled']
-        aggregated['isPreferred'] = aggregated['sessionDate'].apply(lambda x: x in preferred_dates)
-
-        # FILTER AND SORT RECOMMENDATIONS
-        filtered = aggregated[aggregated['availableSlots'] > 0]
-        return filtered.sort_values(
-            by=['isPreferred', 'availableSlots', 'sessionDate', 'startTime', 'endTime'],
-            ascending=[False, False, False, True, True]
-        ).to_dict(orient='records')
-
-
-    def get_capacity(self, facility_code):
-        try:
-            # RETRIEVE CLASSROOM INSTANCE THAT MATCHES CLASSROOM CODE
-            classroom = Classroom.objects.get(classroom_code=facility_code)
-            return {
-                "capacity": classroom.capacity,
-                "facilityId": Facility.objects.get(
-                    content_type=ContentType.objects.get_for_model(Classroom),
-                    object_id=facility_code
-                ).id
+    def prepare_recommendations(self, offerings, preferred_dates):
+        # FLAG PREFERRED DATES AND SORT IN THE DATABASE
+        recommendations = offerings.annotate(
+            isPreferred=Case(When(session_date__in=preferred_dates, then=Value(True)), default=Value(False), output_field=BooleanField())
+        ).order_by('-isPreferred', '-availableSlots', '-sessionDate', 'startTime', 'endTime', 'classroom_code')
+
+        return [
+            {
+                'sessionDate': recommendation['sessionDate'],
+                'classroom': recommendation['classroom_code'],
+                'instructor': recommendation['instructor_name'],
+                'instructorCode': recommendation['instructorCode'],
+                'capacity': recommendation['capacity'],
+                'startTime': recommendation['startTime'],
+                'endTime': recommendation['endTime'],
+                'facilityId': recommendation['facilityId'],
+                'scheduled': recommendation['scheduled'],
+                'availableSlots': recommendation['availableSlots'],
+                'isPreferred': recommendation['isPreferred'],
             }
-        except (Classroom.DoesNotExist, Facility.DoesNotExist):
-            return {"capacity": None, "facilityId": None}
-
+            for recommendation in recommendations
+        ]
@@ -3,9 +3,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from datetime import datetime
 from ..utils import get_classroom_utilization
+from ....analytics_cache import cached_analytics
 
 
 class ClassroomUtilization(APIView):
+  @cached_analytics('classroom-utilization')
   def get(self, request):
     try:
       branch = request.query_params.get('branch')
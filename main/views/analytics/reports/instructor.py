@@ -3,9 +3,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from datetime import datetime, timedelta
 from ..utils import get_instructor_utilization
+from ....analytics_cache import cached_analytics
 
 
 class InstructorUtilization(APIView):
+    @cached_analytics('instructor-utilization')
     def get(self, request):
         try:
             branch = request.query_params.get('branch')
@@ -0,0 +1,10 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from ....analytics_cache import cache_metrics
+
+
+class AnalyticsCacheStats(APIView):
+    def get(self, request):
+        # HIT/MISS COUNTS PER CACHED ANALYTICS ENDPOINT AND OVERALL
+        return Response(cache_metrics(), status=status.HTTP_200_OK)
@@ -1,12 +1,14 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django_pandas.io import read_frame
-from django.db.models import Q
+from django.db.models import Count, Exists, F, OuterRef
+from collections import defaultdict
 from datetime import datetime
-from ....models import Enrollment
+from ....models import Enrollment, Session
+from ....analytics_cache import cached_analytics
 
 
 class EnrollmentTrends(APIView):
+    @cached_analytics('enrollment-trends')
     def get(self, request):
         # FILTER PARAMETERS
         branch = request.query_params.get('branch', None)
@@ -25,20 +27,26 @@ class EnrollmentTrends(APIView):
         # FILTER ENROLLMENTS BASED ON BRANCH AND DATE RANGE
         enrollments = enrollments.filter(enrollment_date__gte=start_date)
         if end_date:
-            enrollments = enrollments.filter(Q(session__session_date__lte=end_date))
+            # KEEP ENROLLMENTS WITH A SESSION ON OR BEFORE END DATE WITHOUT JOINING THEIR SESSIONS
+            enrollments = enrollments.filter(Exists(
+                Session.objects.filter(enrollment=OuterRef('pk'), session_date__lte=end_date)
+            ))
         if branch:
             enrollments = enrollments.filter(branch=branch)
-        
-        # CONVERT DATA TO DATAFRAME AND AGGREGATE SAME ENROLLMENTS
-        df_enrollments = read_frame(enrollments, fieldnames=['enrollment_id', 'course', 'course__course_category', 'branch'])
-        df_enrollments = df_enrollments.groupby('enrollment_id').agg({
-            'course': 'first',
-            'course__course_category': 'first',
-            'branch': 'first'
-        }).reset_index()
+
+        # ENROLLMENTS PER (COURSE CATEGORY, COURSE) AND PER BRANCH, COUNTED IN THE DATABASE
+        course_counts = enrollments.values(
+            category=F('course__course_category__category_name'),
+            name=F('course__course_name'),
+        ).annotate(count=Count('enrollment_id', distinct=True)).order_by('category', '-count', 'name')
+
+        branch_counts = enrollments.values(
+            name=F('branch__branch_name'),
+        ).annotate(count=Count('enrollment_id', distinct=True)).order_by('name')
 
         # TOTAL ENROLLMENTS FOR PERCENTAGE CALCULATION
-        total_enrollments = df_enrollments.shape[0]
+        branch_counts = list(branch_counts)
+        total_enrollments = sum(row['count'] for row in branch_counts)
 
         if total_enrollments == 0:
             return Response({
@@ -47,31 +55,25 @@ class EnrollmentTrends(APIView):
                 'branchStats': []
             })
 
-        # COURSE CATEGORY STATS
-        course_category_stats = (
-            df_enrollments.groupby('course__course_category')
-            .size().reset_index(name='count')
-            .rename(columns={'course__course_category': 'name'})
-        )
-        course_category_stats['percentage'] = (course_category_stats['count'] / total_enrollments * 100).astype(int)
-        course_category_stats = course_category_stats[['name', 'count', 'percentage']].to_dict(orient='records')
+        def percentage(count):
+            return int(count / total_enrollments * 100)
 
         # COURSE STATS
-        course_stats = {}
-        for course_category, group in df_enrollments.groupby('course__course_category'):
-            stats = group['course'].value_counts().reset_index(name='count').rename(columns={'course': 'name'})
-            stats['percentage'] = (stats['count'] / total_enrollments * 100).astype(int)
-            stats['percentage'] = stats['percentage'].fillna(0)
-            course_stats[course_category] = stats[['name', 'count', 'percentage']].to_dict(orient='records')
+        course_stats = defaultdict(list)
+        for row in course_counts:
+            course_stats[row['category']].append({'name': row['name'], 'count': row['count'], 'percentage': percentage(row['count'])})
+
+        # COURSE CATEGORY STATS
+        course_category_stats = [
+            {'name': category, 'count': sum(course['count'] for course in courses), 'percentage': percentage(sum(course['count'] for course in courses))}
+            for category, courses in course_stats.items()
+        ]
 
         # BRANCH STATS
-        branch_stats = (
-            df_enrollments.groupby('branch')
-            .size().reset_index(name='count')
-            .rename(columns={'branch': 'name'})
-        )
-        branch_stats['percentage'] = (branch_stats['count'] / total_enrollments * 100).astype(int)
-        branch_stats = branch_stats[['name', 'count', 'percentage']].to_dict(orient='records')
+        branch_stats = [
+            {'name': row['name'], 'count': row['count'], 'percentage': percentage(row['count'])}
+            for row in branch_counts
+        ]
 
         return Response({
             'courseStats': course_stats,
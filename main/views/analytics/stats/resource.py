@@ -1,33 +1,53 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django_pandas.io import read_frame
+from django.db.models import CharField, Count, Value
+from collections import defaultdict
 from ....models import Instructor, Classroom, Vehicle
+from ....analytics_cache import cached_analytics
 
 
 class ResourceStats(APIView):
+    # COUNTED RESOURCES PER TYPE: (RESPONSE KEY, MODEL, STATUS TEST)
+    RESOURCES = {
+        'Instructor': ('instructorCount', Instructor, lambda status: status not in ['Archived', 'Inactive']),
+        'Classroom': ('classroomCount', Classroom, lambda status: status == 'Available'),
+        'Vehicle': ('vehicleCount', Vehicle, lambda status: status == 'Available'),
+    }
+
+    @cached_analytics('resource-stats')
     def get(self, request):
         branch = request.query_params.get('branch', None)
+        all_branches = str(request.query_params.get('all_branches', '')).lower() in ('true', '1', 'yes')
 
-        # FILTER RESOURCES BY BRANCH
-        instructors = Instructor.objects.exclude(status__in=['Archived', 'Inactive'])
-        classrooms = Classroom.objects.filter(status="Available")
-        vehicles = Vehicle.objects.filter(status="Available")
-
-        if branch:
-            instructors = instructors.filter(branch=branch)
-            classrooms = classrooms.filter(branch=branch)
-            vehicles = vehicles.filter(branch=branch)
+        # ONE QUERY: RESOURCES PER (TYPE, BRANCH, STATUS), UNION ALL OF ONE GROUP BY PER MODEL
+        grouped = []
+        for resource_type, (_, model, _) in self.RESOURCES.items():
+            resources = model.objects.all()
+            if branch:
+                resources = resources.filter(branch=branch)
+            grouped.append(resources.values('branch', 'status').annotate(
+                resource_type=Value(resource_type, output_field=CharField()),
+                count=Count('pk'),
+            ).order_by())
+        counts = grouped[0].union(*grouped[1:], all=True)
 
-        df_instructors = read_frame(instructors, fieldnames=['instructor_code'])
-        df_classrooms = read_frame(classrooms, fieldnames=['classroom_code'])
-        df_vehicles = read_frame(vehicles, fieldnames=['vehicle_code'])
+        branch_counts = defaultdict(lambda: {key: 0 for key, _, _ in self.RESOURCES.values()})
+        branch_statuses = defaultdict(lambda: {resource_type: {} for resource_type in self.RESOURCES})
+        for row in counts:
+            key, _, is_counted = self.RESOURCES[row['resource_type']]
+            branch_statuses[row['branch']][row['resource_type']][row['status']] = row['count']
+            if is_counted(row['status']):
+                branch_counts[row['branch']][key] += row['count']
 
-        instructor_count = df_instructors.shape[0]
-        classroom_count = df_classrooms.shape[0]
-        vehicle_count = df_vehicles.shape[0]
+        # TOTALS ACROSS THE MATCHED BRANCHES
+        totals = {key: sum(resource_counts[key] for resource_counts in branch_counts.values()) for key, _, _ in self.RESOURCES.values()}
+        if not all_branches:
+            return Response(totals)
 
         return Response({
-            'instructorCount': instructor_count,
-            'classroomCount': classroom_count,
-            'vehicleCount': vehicle_count
+            **totals,
+            'branches': [
+                {'branch': name, **branch_counts[name], 'statusCounts': branch_statuses[name]}
+                for name in sorted(branch_statuses)
+            ],
         })
@@ -1,24 +1,37 @@
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django_pandas.io import read_frame
-import pandas as pd
+from django.db.models import Case, CharField, Count, DateField, F, Func, Max, Min, Q, Value, When
+from django.db.models.functions import ExtractIsoWeekDay, Trunc
+from collections import defaultdict
 from datetime import datetime
 from ....models import Session
+from ....analytics_cache import cached_analytics
 
 
 class MonthlyAndDailyStats(APIView):
+    GRANULARITIES = ['day', 'week', 'month', 'quarter']
+    DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+    @cached_analytics('sessions-over-time')
     def get(self, request):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         branch = request.query_params.get('branch')
+        granularity = request.query_params.get('granularity', 'month')
+
+        if granularity not in self.GRANULARITIES:
+            return Response({'error': f"granularity must be one of {', '.join(self.GRANULARITIES)}."}, status=status.HTTP_400_BAD_REQUEST)
 
         # SET DEFAULT START DATE IF NOT PROVIDED
-        if not start_date:
-            start_date = datetime(datetime.now().year, 1, 1).date()
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else datetime(datetime.now().year, 1, 1).date()
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+        except ValueError:
+            return Response({"error": "Invalid date format. Please use yyyy-mm-dd."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # LOAD DATA INTO A DATAFRAME
         sessions = Session.objects.exclude(status__in=['Archived', 'Cancelled'])
-        
+
         # FILTER SESSIONS BASED ON BRANCH AND DATE RANGE
         sessions = sessions.filter(session_date__gte=start_date)
         if end_date:
@@ -26,15 +39,20 @@ class MonthlyAndDailyStats(APIView):
         if branch:
             sessions = sessions.filter(enrollment__branch=branch)
 
-        # CONVERT DATA TO DATAFRAME
-        df_sessions = read_frame(sessions, fieldnames=['session_date', 'start_time', 'status', 'enrollment__course__course_category__category_code'])
+        # ONE AGGREGATE: SESSIONS PER (date_trunc PERIOD, ISO WEEKDAY)
+        counts = sessions.values(
+            period=Trunc('session_date', granularity, output_field=DateField()),
+            weekday=ExtractIsoWeekDay('session_date'),
+        ).annotate(count=Count('session_id'), first_date=Min('session_date'), last_date=Max('session_date')).order_by('period', 'weekday')
 
-        # FORMAT COLUMNS
-        df_sessions['session_date'] = pd.to_datetime(df_sessions['session_date'])
-        df_sessions['start_time'] = pd.to_datetime(df_sessions['start_time'], format='%H:%M:%S').dt.time
+        periods = defaultdict(dict)
+        years = set()
+        for row in counts:
+            periods[row['period']][row['weekday']] = row['count']
+            years.update((row['first_date'].year, row['last_date'].year))
 
         # TOTAL NUMBER OF SESSIONS FOR PERCENTAGE CALCULATION
-        total_sessions = df_sessions.shape[0]
+        total_sessions = sum(sum(weekdays.values()) for weekdays in periods.values())
 
         if total_sessions == 0:
             return Response({
@@ -42,32 +60,48 @@ class MonthlyAndDailyStats(APIView):
                 'dailyStats': {},
             })
 
-        # MONTHLY STATS
-        session_trends = (
-            df_sessions.groupby(df_sessions['session_date'].dt.to_period('M'))
-            .size()
-            .reset_index(name='count'))
-        session_trends['month'] = session_trends['session_date'].dt.strftime('%b')
-        session_trends['percentage'] = (session_trends['count'] / total_sessions * 100).round(0).astype(int)
-        monthly_stats = session_trends[['month', 'count', 'percentage']].to_dict(orient='records')
-
-        # DAILY STATS GROUPED BY MONTH
-        df_sessions['day'] = df_sessions['session_date'].dt.strftime('%a')
-        day_order = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        # LABEL WITH THE YEAR ONLY WHEN THE SESSIONS IN RANGE SPAN MORE THAN ONE, SO SINGLE-YEAR LABELS STAY AS BEFORE;
+        # FROM THE SESSION DATES, NOT THE PERIOD KEYS, SINCE A WEEK STARTING IN DECEMBER WOULD MAKE A JANUARY RANGE LOOK MULTI-YEAR
+        multi_year = len(years) > 1
+        labels = {period: self.label(period, granularity, multi_year) for period in periods}
+
+        monthly_stats = [
+            {
+                'month': labels[period],
+                'period': period,
+                'count': sum(weekdays.values()),
+                'percentage': round(sum(weekdays.values()) / total_sessions * 100),
+            }
+            for period, weekdays in periods.items()
+        ]
+
+        # DAILY STATS GROUPED BY PERIOD, MONDAY FIRST
         daily_stats = {
-            month: group.groupby('day').size().reset_index(name='count').sort_values(by='day', key=lambda x: x.map({day: i for i, day in enumerate(day_order)}))
-            for month, group in df_sessions.groupby(df_sessions['session_date'].dt.strftime('%b'))
+            labels[period]: [
+                {'day': self.DAYS[weekday - 1], 'count': count, 'percentage': round(count / total_sessions * 100)}
+                for weekday, count in sorted(weekdays.items())
+            ]
+            for period, weekdays in periods.items()
         }
-        for month, stats in daily_stats.items():
-            stats['percentage'] = (stats['count'] / total_sessions * 100).round(0).astype(int)
-            daily_stats[month] = stats[['day', 'count', 'percentage']].to_dict(orient='records')
 
         return Response({
+            'granularity': granularity,
             'monthlyStats': monthly_stats,
             'dailyStats': daily_stats,
         })
 
+    @staticmethod
+    def label(period, granularity, multi_year):
+        if granularity == 'quarter':
+            label = f"Q{(period.month - 1) // 3 + 1}"
+        elif granularity == 'month':
+            label = period.strftime('%b')
+        else:
+            label = period.strftime('%b %d')
+        return f"{label} {period.year}" if multi_year else label
+
 class SessionTrends(APIView):
+    @cached_analytics('session-trends')
     def get(self, request):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
@@ -78,32 +112,49 @@ class SessionTrends(APIView):
             start_date = datetime(datetime.now().year, datetime.now().month, 1)
         else:
             start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        
-        # LOAD DATA INTO A DATAFRAME
-        sessions = Session.objects.exclude(status__in=['Archived', 'Cancelled'])
-        
-        # FILTER SESSIONS BASED ON BRANCH AND DATE RANGE
-        sessions = sessions.filter(session_date__gte=start_date)
+
+        # SESSIONS IN THE RANGE, PLUS EVERY "SCHEDULED" SESSION FOR THE SCHEDULED COUNT
+        in_range = Q(session_date__gte=start_date)
         if end_date:
-            sessions = sessions.filter(session_date__lte=end_date)
-        if branch:
-            sessions = sessions.filter(enrollment__branch=branch)
+            in_range &= Q(session_date__lte=end_date)
 
-        # COUNT SCHEDULES WITH "SCHEDULED" STATUS
+        sessions = Session.objects.exclude(status__in=['Archived', 'Cancelled']).filter(in_range | Q(status='Scheduled'))
         if branch:
-            scheduled_count = Session.objects.filter(status='Scheduled', enrollment__branch=branch).count()
-        else:
-            scheduled_count = Session.objects.filter(status='Scheduled').count()
-
-        # CONVERT DATA TO DATAFRAME
-        df_sessions = read_frame(sessions, fieldnames=['session_date', 'start_time', 'status', 'enrollment__course__course_category__category_code'])
+            sessions = sessions.filter(enrollment__branch=branch)
 
-        # FORMAT COLUMNS
-        df_sessions['session_date'] = pd.to_datetime(df_sessions['session_date'])
-        df_sessions['start_time'] = pd.to_datetime(df_sessions['start_time'], format='%H:%M:%S').dt.time
+        # ONE AGGREGATE OVER THE FINEST BUCKETS; EVERY BREAKDOWN BELOW IS A ROLLUP OF THESE FEW ROWS
+        buckets = sessions.values(
+            'status',
+            time_period=Case(
+                When(start_time__hour__lt=12, then=Value('Morning')),
+                When(start_time__hour__lt=17, then=Value('Afternoon')),
+                default=Value('Evening'),
+            ),
+            time_range=Func(F('start_time'), Value('HH12:MI'), function='to_char', output_field=CharField()),
+            category_code=F('enrollment__course__course_category__category_code'),
+        ).annotate(
+            count=Count('session_id', filter=in_range),
+            scheduled=Count('session_id', filter=Q(status='Scheduled')),
+        )
+
+        time_periods = defaultdict(int)
+        time_ranges = defaultdict(lambda: defaultdict(int))
+        statuses = defaultdict(int)
+        course_categories = defaultdict(lambda: defaultdict(int))
+        scheduled_count = 0
+
+        for bucket in buckets:
+            scheduled_count += bucket['scheduled']
+            if not bucket['count']:
+                continue
+            time_periods[bucket['time_period']] += bucket['count']
+            time_ranges[bucket['time_period']][bucket['time_range']] += bucket['count']
+            statuses[bucket['status']] += bucket['count']
+            if bucket['category_code'] is not None:
+                course_categories[bucket['status']][bucket['category_code']] += bucket['count']
 
         # TOTAL NUMBER OF SESSIONS FOR PERCENTAGE CALCULATION
-        total_sessions = df_sessions.shape[0]
+        total_sessions = sum(time_periods.values())
 
         if total_sessions == 0:
             return Response({
@@ -114,55 +165,28 @@ class SessionTrends(APIView):
                 'scheduledCount': 0,
             })
 
-        # CATEGORIZE SESSIONS BY TIME PERIOD
-        df_sessions['time_period'] = df_sessions['start_time'].apply(self.categorize_time)
-
-        # TIME PERIOD STATS
-        time_period_stats = df_sessions.groupby('time_period').size().reset_index(name='count').rename(columns={'time_period': 'name'})
-        time_period_stats['percentage'] = (time_period_stats['count'] / total_sessions * 100).round(0).astype(int)
-        time_period_stats = time_period_stats[['name', 'count', 'percentage']].to_dict(orient='records')
-
-        # TIME RANGE STATS GROUPED BY TIME PERIOD
-        df_sessions['time_range'] = df_sessions.apply(self.combine_time_range, axis=1)
-        time_range_stats = {
-            time_period: group.groupby('time_range').size().reset_index(name='count').rename(columns={'time_range': 'name'})
-            for time_period, group in df_sessions.groupby('time_period')
-        }
-        for time_period, stats in time_range_stats.items():
-            stats['percentage'] = (stats['count'] / total_sessions * 100).round(0).astype(int)
-            time_range_stats[time_period] = stats[['name', 'count', 'percentage']].to_dict(orient='records')
-
-        # STATUS STATS
-        status_stats = df_sessions.groupby('status').size().reset_index(name='count').rename(columns={'status': 'name'})
-        status_stats['percentage'] = (status_stats['count'] / total_sessions * 100).round(0).astype(int)
-        status_stats = status_stats[['name', 'count', 'percentage']].to_dict(orient='records')
-
-        # COURSE CATEGORY STATS GROUPED BY STATUS
-        course_category_stats = {
-            status: df_sessions[df_sessions['status'] == status]
-            .groupby('enrollment__course__course_category__category_code').size().reset_index(name='count').rename(columns={'enrollment__course__course_category__category_code': 'name'})
-            for status in df_sessions['status'].unique()
-        }
-        for status, stats in course_category_stats.items():
-            stats['percentage'] = (stats['count'] / total_sessions * 100).astype(int)
-            course_category_stats[status] = stats[['name', 'count', 'percentage']].to_dict(orient='records')
-
         return Response({
-            'timeRangeStats': time_range_stats,
-            'timePeriodStats': time_period_stats,
-            'statusStats': status_stats,
-            'courseCategoryStats': course_category_stats,
+            'timeRangeStats': {
+                time_period: self.stats(time_ranges[time_period], total_sessions)
+                for time_period in sorted(time_ranges)
+            },
+            'timePeriodStats': self.stats(time_periods, total_sessions),
+            'statusStats': self.stats(statuses, total_sessions),
+            'courseCategoryStats': {
+                session_status: self.stats(course_categories[session_status], total_sessions, rounded=False)
+                for session_status in sorted(course_categories)
+            },
             'scheduledCount': scheduled_count,
         })
 
     @staticmethod
-    def categorize_time(start_time):
-        if start_time.hour < 12:
-            return 'Morning'
-        elif start_time.hour < 17:
-            return 'Afternoon'
-        return 'Evening'
-
-    @staticmethod
-    def combine_time_range(row):
-        return row['start_time'].strftime('%I:%M')
\ No newline at end of file
+    def stats(counts, total_sessions, rounded=True):
+        # NAME-SORTED ROWS; PERCENTAGES ROUND HALF TO EVEN AS PANDAS DID (COURSE CATEGORIES WERE ALWAYS TRUNCATED)
+        return [
+            {
+                'name': name,
+                'count': count,
+                'percentage': round(count / total_sessions * 100) if rounded else int(count / total_sessions * 100),
+            }
+            for name, count in sorted(counts.items())
+        ]
@@ -1,4 +1,5 @@
 from .date_range_calculator import calculate_date_range
+from .resource_hours import get_facility_hours, get_instructor_hours, get_rollup_hours
 from .utilization_calculator import calculate_utilization
 from .classroom_utilization import get_classroom_utilization
 from .instructor_utilization import get_instructor_utilization
@@ -1,7 +1,7 @@
 from django_pandas.io import read_frame
 import pandas as pd
-from ....models import Session, Instructor
-from . import calculate_date_range
+from ....models import Instructor
+from . import calculate_date_range, get_instructor_hours
 
 
 def get_instructor_utilization(branch=None, start_date=None, end_date=None, instructor_code=None):
@@ -23,58 +23,10 @@ def get_instructor_utilization(branch=None, start_date=None, end_date=None, inst
             'instructor_code', 'first_name', 'is_senior', 'branch__branch_name'
         )
 
-    # FETCH SESSIONS BY BRANCH
-    sessions_query = Session.objects.filter(session_date__range=[start_date, end_date], status__in=['Completed', 'Scheduled'])
-    if branch:
-        sessions_query = sessions_query.filter(enrollment__branch=branch)
-
-    # CONVERT DATA TO DF
+    # HOURS ASSIGNED PER INSTRUCTOR, MERGED AND AGGREGATED IN THE DATABASE
     df_instructors = read_frame(instructors)
-    df_sessions = read_frame(sessions_query.values(
-        'instructor_id', 'start_time', 'end_time', 'session_date', 
-        'enrollment__course__course_category__category_type'
-    ))
-
-    if not df_sessions.empty:
-        # FORMAT START AND END TIME
-        df_sessions['start_datetime'] = pd.to_datetime(df_sessions['session_date'].astype(str) + ' ' + df_sessions['start_time'].astype(str))
-        df_sessions['end_datetime'] = pd.to_datetime(df_sessions['session_date'].astype(str) + ' ' + df_sessions['end_time'].astype(str))
-
-        # SORT AND GROUP SESSIONS BY INSTRUCTOR
-        df_sessions = df_sessions.sort_values(by=['instructor_id', 'start_datetime'])
-        grouped_sessions = df_sessions.groupby('instructor_id')
-
-        # HANDLE OVERLAPPING SESSIONS
-        adjusted_durations = []
-        for instructor_id, group in grouped_sessions:
-            group = group.sort_values('start_datetime')
-            total_duration = 0
-            current_start = None
-            current_end = None
-
-            for _, session in group.iterrows():
-                if current_start is None:
-                    # Start tracking a new time range
-                    current_start = session['start_datetime']
-                    current_end = session['end_datetime']
-                elif session['start_datetime'] <= current_end:
-                    # Overlapping session, extend the current range
-                    current_end = max(current_end, session['end_datetime'])
-                else:
-                    # No overlap, finalize the previous range
-                    total_duration += (current_end - current_start).total_seconds() / 3600  # Convert to hours
-                    current_start = session['start_datetime']
-                    current_end = session['end_datetime']
-
-            # Finalize the last range
-            if current_start and current_end:
-                total_duration += (current_end - current_start).total_seconds() / 3600
-
-            adjusted_durations.append({'instructor_id': instructor_id, 'hoursAssigned': total_duration})
-
-        utilization = pd.DataFrame(adjusted_durations)
-    else:
-        utilization = pd.DataFrame(columns=['instructor_id', 'hoursAssigned'])
+    hours_assigned = get_instructor_hours(start_date, end_date, branch)
+    utilization = pd.DataFrame(list(hours_assigned.items()), columns=['instructor_id', 'hoursAssigned'])
 
     # MERGE INSTRUCTOR DATA WITH UTILIZATION
     utilization = pd.merge(df_instructors, utilization, left_on='instructor_code', right_on='instructor_id', how='left')
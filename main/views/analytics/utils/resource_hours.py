@@ -0,0 +1,19 @@
+from django.db.models import Sum
+from ....models import UtilizationRollup
+
+
+def get_facility_hours(facility_type, start_date, end_date, branch=None):
+    # SUM THE DAILY ROLLUP; A SLOT SHARED BY SEVERAL STUDENTS COUNTS ONCE AT ITS COURSE TYPE'S HOURS
+    return get_rollup_hours(facility_type, 'hours_assigned', start_date, end_date, branch)
+
+
+def get_instructor_hours(start_date, end_date, branch=None):
+    # SUM THE DAILY ROLLUP; OVERLAPPING SESSIONS ARE MERGED SO SHARED CLASSES COUNT ONCE
+    return get_rollup_hours('Instructor', 'merged_hours', start_date, end_date, branch)
+
+
+def get_rollup_hours(resource_type, field, start_date, end_date, branch=None):
+    rollups = UtilizationRollup.objects.filter(resource_type=resource_type, date__range=[start_date, end_date])
+    rollups = rollups.filter(branch=branch) if branch else rollups.filter(branch__isnull=True)
+
+    return dict(rollups.values('resource_code').annotate(hours=Sum(field)).values_list('resource_code', 'hours'))
@@ -1,26 +1,7 @@
-import pandas as pd
-
-
-def calculate_utilization(df_sessions, df_facilities, start_date, end_date):
-    # REMOVE DUPLICATES BASED ON SESSION DATE, START TIME, AND END TIME
-    df_sessions = df_sessions.drop_duplicates(subset=['facility__object_id', 'session_date', 'start_time', 'end_time'])
-
-    # CREATE DATETIME COLUMNS
-    df_sessions.loc[:, 'start_datetime'] = pd.to_datetime(df_sessions['session_date'].astype(str) + ' ' + df_sessions['start_time'].astype(str))
-    df_sessions.loc[:, 'end_datetime'] = pd.to_datetime(df_sessions['session_date'].astype(str) + ' ' + df_sessions['end_time'].astype(str))
-
-    # SET SESSION DURATION BASED ON COURSE CATEGORY TYPE
-    df_sessions.loc[:, 'duration'] = df_sessions['enrollment__course__course_category__category_type'].apply(
-    lambda x: 2.0 if x == 'PDC' else (7.5 if x == 'TDC' else 0)
-    )
-
-    # AGGREGATE AND CALCULATE TOTAL HOURS ASSIGNED
-    utilization = df_sessions.groupby('facility__object_id')['duration'].sum().reset_index()
-    utilization.columns = ['facility_code', 'hoursAssigned']
-
-    # MERGE WITH FACILITY DATA
-    utilization = pd.merge(df_facilities, utilization, left_on='facility_code', right_on='facility_code', how='left')
-    utilization['hoursAssigned'] = utilization['hoursAssigned'].fillna(0).infer_objects(copy=False)
+def calculate_utilization(hours_assigned, df_facilities, start_date, end_date):
+    # ATTACH THE HOURS ASSIGNED PER FACILITY CODE
+    utilization = df_facilities.copy()
+    utilization['hoursAssigned'] = utilization['facility_code'].map(hours_assigned).fillna(0.0).astype(float)
 
     # CALCULATE TOTAL HOURS AVAILABLE
     total_days = (end_date - start_date).days + 1
@@ -1,7 +1,6 @@
 from django_pandas.io import read_frame
-import pandas as pd
-from ....models import Session, Vehicle
-from . import calculate_date_range, calculate_utilization
+from ....models import Vehicle
+from . import calculate_date_range, calculate_utilization, get_facility_hours
 
 
 def get_vehicle_utilization(branch=None, start_date=None, end_date=None):
@@ -21,30 +20,15 @@ def get_vehicle_utilization(branch=None, start_date=None, end_date=None):
     else:
         vehicles = Vehicle.objects.exclude(status__in=['Archived', 'Unavailable']).values('vehicle_code', 'vehicle_model', 'color', 'transmission_type', 'wheel_num', 'branch__branch_name')
 
-    # FETCH SESSIONS AND FILTER BY BRANCH AND DATE RANGE
-    sessions = Session.objects.exclude(status__in=['Archived', 'Unavailable']).filter(session_date__range=[start_date, end_date])
-    if branch:
-        sessions = sessions.filter(enrollment__branch=branch)
-    
     # CONVERT VEHICLES TO DATAFRAME
     df_facilities = read_frame(vehicles)
     df_facilities = df_facilities.rename(columns={'vehicle_code': 'facility_code'})
 
-    if sessions.exists():
-        df_sessions = read_frame(sessions.values(
-            'facility__object_id', 'start_time', 'end_time', 'session_date', 'enrollment__course__course_category__category_type'
-        ))
-        utilization, overall_utilization_rate, total_hours_assigned, total_hours_available = calculate_utilization(
-            df_sessions, df_facilities, start_date, end_date
-        )
-    else:
-        utilization = df_facilities.copy()
-        utilization['hoursAssigned'] = 0
-        utilization['hoursAvailable'] = (end_date - start_date).days * 8
-        utilization['utilizationRate'] = 0
-        overall_utilization_rate = 0
-        total_hours_assigned = 0
-        total_hours_available = 0
+    # HOURS ASSIGNED PER VEHICLE, AGGREGATED IN THE DATABASE
+    hours_assigned = get_facility_hours('Vehicle', start_date, end_date, branch)
+    utilization, overall_utilization_rate, total_hours_assigned, total_hours_available = calculate_utilization(
+        hours_assigned, df_facilities, start_date, end_date
+    )
 
     # FORMAT RESPONSE DATA
     utilization_data = utilization[['facility_code', 'vehicle_model', 'color', 'transmission_type', 'wheel_num', 'hoursAvailable', 'hoursAssigned', 'utilizationRate', 'branch__branch_name']]
@@ -16,7 +16,7 @@ class EnrollmentFilter(django_filters.FilterSet):
         fields = ['status', 'course_category_type', 'branch']
 
 class EnrollmentList(generics.ListCreateAPIView):
-    queryset = Enrollment.objects.exclude(status='Archived')
+    queryset = EnrollmentSerializer.setup_eager_loading(Enrollment.objects.exclude(status='Archived'))
     serializer_class = EnrollmentSerializer
     pagination_class = LargeResultsSetPagination
     filter_backends = (DjangoFilterBackend, filters.SearchFilter)
@@ -26,7 +26,7 @@ class EnrollmentList(generics.ListCreateAPIView):
     ordering = 'enrollment_date'
 
 class EnrollmentDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Enrollment.objects.exclude(status='Archived')
+    queryset = EnrollmentSerializer.setup_eager_loading(Enrollment.objects.exclude(status='Archived'))
     serializer_class = EnrollmentSerializer
     lookup_field = 'enrollment_id'
 
@@ -36,4 +36,4 @@ class StudentEnrollmentList(generics.ListAPIView):
     def get_queryset(self):
         student_code = self.kwargs['student_code']
         student = Student.objects.get(pk = student_code)
-        return Enrollment.objects.filter(student = student).exclude(status='Archived')
\ No newline at end of file
+        return EnrollmentSerializer.setup_eager_loading(Enrollment.objects.filter(student = student).exclude(status='Archived'))
\ No newline at end of file
@@ -9,6 +9,7 @@ from datetime import datetime
 from django.core.exceptions import ObjectDoesNotExist
 from ..models import Instructor, User, Branch, Session
 from ..serializers import InstructorSerializer, SessionSerializer
+from ..availability import parse_time_window, get_busy_instructors
 
 
 class InstructorList(generics.ListCreateAPIView):
@@ -29,21 +30,9 @@ class InstructorList(generics.ListCreateAPIView):
 
         if date and start_time:
             try:
-                start_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
-
-                if end_time:
-                    end_datetime = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M")
-                else:
-                    end_datetime = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M") if end_time else datetime.strptime(f"{date} 23:59", "%Y-%m-%d %H:%M")
-
-                busy_instructors = Session.objects.filter(
-                    session_date=date,
-                    start_time__lt=end_datetime,
-                    end_time__gt=start_datetime,
-                    status__in=['Completed', 'Scheduled']
-                ).values_list('instructor__instructor_code', flat=True)
-
-                queryset = queryset.exclude(instructor_code__in=list(busy_instructors))
+                session_date, start_time, end_time = parse_time_window(date, start_time, end_time)
+                busy_instructors = get_busy_instructors(session_date, start_time, end_time)
+                queryset = queryset.exclude(instructor_code__in=busy_instructors)
             except ValueError:
                 pass
 
@@ -194,7 +183,7 @@ class InstructorSessions(APIView):
         
         try:
             instructor = Instructor.objects.get(user__email=email)
-            sessions = Session.objects.filter(instructor=instructor)
+            sessions = SessionSerializer.setup_eager_loading(Session.objects.filter(instructor=instructor))
 
             remaining_sessions_today_count = sessions.filter(
                 status='Scheduled',
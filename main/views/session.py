@@ -1,12 +1,14 @@
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.core.exceptions import ValidationError
 from django.db.models import Q
 from datetime import datetime
 from ..pagination import LargeResultsSetPagination
-from ..models import Session, Vehicle, Classroom, Student, Enrollment
-from ..serializers import SessionSerializer
+from ..models import Session, Student, Enrollment, Instructor, Facility, Vehicle, Classroom
+from ..serializers import SessionSerializer, SessionBatchItemSerializer
 
 
 class SessionList(generics.ListCreateAPIView):
@@ -51,19 +53,17 @@ class SessionList(generics.ListCreateAPIView):
         facility_name = self.request.query_params.get('facility', None)
         
         if facility_name:
-            vehicle_ids = Vehicle.objects.filter(name__icontains=facility_name).values_list('id', flat=True)
-            classroom_ids = Classroom.objects.filter(name__icontains=facility_name).values_list('id', flat=True)
             queryset = queryset.filter(
-                Q(facility__object_id__in=vehicle_ids) | Q(facility__object_id__in=classroom_ids)
+                Q(facility__object_id__icontains=facility_name) | Q(facility__display_name__icontains=facility_name)
             )
-        return queryset
+        return SessionSerializer.setup_eager_loading(queryset)
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class SessionDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Session.objects.exclude(status='Archived')
+    queryset = SessionSerializer.setup_eager_loading(Session.objects.exclude(status='Archived'))
     serializer_class = SessionSerializer
     lookup_field = 'session_id'
 
@@ -81,14 +81,16 @@ class StudentSessions(generics.ListAPIView):
         
         enrollments = Enrollment.objects.filter(student=student).exclude(status='Archived')
         
-        return Session.objects.filter(enrollment__in=enrollments).exclude(status='Archived').select_related('enrollment', 'enrollment__course').prefetch_related('facility')
+        return SessionSerializer.setup_eager_loading(
+            Session.objects.filter(enrollment__in=enrollments).exclude(status='Archived')
+        )
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
 
         grouped_sessions = {}
-        for session in queryset:
-            enrollment_id = session.enrollment.enrollment_id
+        for session in SessionSerializer(queryset, many=True).data:
+            enrollment_id = session['enrollment']
             if enrollment_id not in grouped_sessions:
                 grouped_sessions[enrollment_id] = []
             grouped_sessions[enrollment_id].append(session)
@@ -99,11 +101,206 @@ class StudentSessions(generics.ListAPIView):
 
     def serialize_grouped_sessions(self, grouped_sessions):
         serialized_data = []
-        for enrollment_id, sessions in grouped_sessions.items():
-            serialized_sessions = SessionSerializer(sessions, many=True).data
+        for enrollment_id, serialized_sessions in grouped_sessions.items():
             enrollment_data = {
                 'enrollment_id': enrollment_id,
                 'sessions': serialized_sessions
             }
             serialized_data.append(enrollment_data)
-        return serialized_data
\ No newline at end of file
+        return serialized_data
+
+
+class SessionBulkSchedule(APIView):
+    ACTIVE_STATUSES = ['Scheduled', 'Completed']
+
+    def post(self, request, *args, **kwargs):
+        items = request.data.get('sessions') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'A non-empty list of sessions is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = SessionBatchItemSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response({'error': 'Invalid sessions.', 'sessions': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        sessions, errors = self.build_sessions(serializer.validated_data)
+        if any(errors):
+            return Response({'error': 'Invalid sessions.', 'sessions': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        conflicts = self.find_conflicts(sessions)
+        if conflicts:
+            return Response({'error': 'Scheduling conflicts found.', 'conflicts': conflicts}, status=status.HTTP_409_CONFLICT)
+
+        created = [session for session in sessions if session._state.adding]
+        updated = [session for session in sessions if not session._state.adding]
+        Session.bulk_schedule(created, updated)
+
+        scheduled_sessions = SessionSerializer.setup_eager_loading(
+            Session.objects.filter(session_id__in=[session.session_id for session in sessions])
+        ).order_by('session_date', 'start_time')
+        return Response(
+            SessionSerializer(scheduled_sessions, many=True).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+    def build_sessions(self, items):
+        existing = Session.objects.in_bulk([item['session_id'] for item in items if 'session_id' in item])
+
+        enrollment_ids = {item['enrollment'] for item in items if 'enrollment' in item}
+        enrollment_ids.update(session.enrollment_id for session in existing.values())
+        instructor_codes = {item['instructor'] for item in items if 'instructor' in item}
+        facility_ids = {item['facility'] for item in items if 'facility' in item}
+        facility_ids.update(session.facility_id for session in existing.values() if session.facility_id)
+
+        enrollments = Enrollment.objects.select_related('course__course_category').in_bulk(enrollment_ids)
+        instructors = Instructor.objects.in_bulk(instructor_codes)
+        facilities = Facility.objects.in_bulk(facility_ids)
+
+        sessions = []
+        errors = []
+        seen_ids = set()
+        for item in items:
+            item_errors = {}
+
+            if 'session_id' in item:
+                if item['session_id'] in seen_ids:
+                    sessions.append(None)
+                    errors.append({'session_id': f"Session {item['session_id']} appears more than once in the batch."})
+                    continue
+                seen_ids.add(item['session_id'])
+
+                session = existing.get(item['session_id'])
+                if session is None:
+                    sessions.append(None)
+                    errors.append({'session_id': f"Session {item['session_id']} does not exist."})
+                    continue
+            else:
+                session = Session(session_nth='1')
+
+            for field in ['session_nth', 'session_date', 'start_time', 'end_time', 'status']:
+                if field in item:
+                    setattr(session, field, item[field])
+
+            related = [
+                ('enrollment', enrollments, item.get('enrollment', session.enrollment_id)),
+                ('instructor', instructors, item.get('instructor', session.instructor_id)),
+                ('facility', facilities, item.get('facility', session.facility_id)),
+            ]
+            for field, lookup, pk in related:
+                if pk in lookup:
+                    setattr(session, field, lookup[pk])
+                elif field in item:
+                    item_errors[field] = f"Invalid pk \"{pk}\" - object does not exist."
+
+            if not item_errors:
+                if session.start_time >= session.end_time:
+                    item_errors['end_time'] = "End time must be after start time."
+                try:
+                    session.clean()
+                except ValidationError as e:
+                    item_errors['non_field_errors'] = e.messages
+
+            sessions.append(session)
+            errors.append(item_errors)
+
+        return sessions, errors
+
+    def find_conflicts(self, sessions):
+        active_sessions = [
+            (index, session) for index, session in enumerate(sessions)
+            if session.status in self.ACTIVE_STATUSES
+        ]
+        if not active_sessions:
+            return []
+
+        # CONFLICTS WITH STORED SESSIONS ARE REJECTED BY THE EXCLUSION CONSTRAINTS ON SAVE
+        booked = {}
+
+        # CHECK EACH SESSION AGAINST THE REST OF THE BATCH
+        conflicts = []
+        for index, session in sorted(active_sessions, key=lambda entry: entry[1].start_time):
+            keys = [('instructor', session.instructor_id, session.session_date)]
+            if session.facility.facility_type == 'Vehicle':
+                keys.append(('facility', session.facility_id, session.session_date))
+
+            for key in keys:
+                intervals = booked.setdefault(key, [])
+                for start_time, end_time, facility_id, source in intervals:
+                    # AN INSTRUCTOR MAY SHARE A SLOT WITH OTHER STUDENTS IN THE SAME ROOM, BUT NO ROOM IS NEVER THE SAME ROOM
+                    if key[0] == 'instructor' and facility_id is not None and facility_id == session.facility_id:
+                        continue
+                    if start_time < session.end_time and end_time > session.start_time:
+                        conflicts.append({'index': index, 'resource': key[0], 'conflictsWith': source})
+                intervals.append((session.start_time, session.end_time, session.facility_id, {'index': index}))
+
+        return sorted(conflicts, key=lambda conflict: conflict['index'])
+
+
+class SessionTimeline(APIView):
+    RESOURCES = {
+        'Instructor': 'instructor_id',
+        'Vehicle': 'facility__object_id',
+        'Classroom': 'facility__object_id',
+    }
+    FACILITY_MODELS = {
+        'Vehicle': (Vehicle, 'vehicle_code'),
+        'Classroom': (Classroom, 'classroom_code'),
+    }
+    STATUSES = [status_code for status_code, _ in Session.STATUS_CHOICES]
+
+    def get(self, request, *args, **kwargs):
+        resource_type = request.query_params.get('resource_type', 'Instructor')
+        if resource_type not in self.RESOURCES:
+            return Response({'error': 'resource_type must be Instructor, Vehicle or Classroom.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start_date = datetime.strptime(request.query_params['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params['end_date'], '%Y-%m-%d').date()
+        except (KeyError, ValueError):
+            return Response({'error': 'start_date and end_date are required (yyyy-mm-dd).'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if end_date < start_date:
+            return Response({'error': 'end_date must not be before start_date.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        codes = list(dict.fromkeys(code for code in request.query_params.get('codes', '').split(',') if code))
+        resource_field = self.RESOURCES[resource_type]
+
+        # SESSIONS WITHOUT THE RESOURCE HAVE NO ROW TO BE DRAWN ON
+        sessions = Session.objects.exclude(status='Archived').exclude(**{f'{resource_field}__isnull': True})
+        sessions = sessions.filter(session_date__range=[start_date, end_date])
+        if resource_type != 'Instructor':
+            sessions = sessions.filter(facility_type=resource_type)
+        if codes:
+            sessions = sessions.filter(**{f'{resource_field}__in': codes})
+
+        # THE BRANCH OF THE RESOURCE ITSELF, NOT OF THE ENROLLMENTS BOOKED ON IT
+        branch = request.query_params.get('branch')
+        if branch and resource_type == 'Instructor':
+            sessions = sessions.filter(instructor__branch=branch)
+        elif branch:
+            model, code_field = self.FACILITY_MODELS[resource_type]
+            sessions = sessions.filter(facility__object_id__in=model.objects.filter(branch=branch).values(code_field))
+
+        # ONE QUERY, ENCODED AS PARALLEL ARRAYS AGAINST DICTIONARY TABLES INSTEAD OF SERIALIZED SESSIONS
+        resources = {code: index for index, code in enumerate(codes)}
+        status_index = {status_code: index for index, status_code in enumerate(self.STATUSES)}
+        intervals = {'sessionId': [], 'resource': [], 'dateOffset': [], 'startMinute': [], 'endMinute': [], 'status': []}
+
+        rows = sessions.order_by(resource_field, 'session_date', 'start_time').values_list(
+            'session_id', resource_field, 'session_date', 'start_time', 'end_time', 'status'
+        )
+        for session_id, code, session_date, start_time, end_time, session_status in rows:
+            intervals['sessionId'].append(session_id)
+            intervals['resource'].append(resources.setdefault(code, len(resources)))
+            intervals['dateOffset'].append((session_date - start_date).days)
+            intervals['startMinute'].append(start_time.hour * 60 + start_time.minute)
+            intervals['endMinute'].append(end_time.hour * 60 + end_time.minute)
+            intervals['status'].append(status_index[session_status])
+
+        return Response({
+            'resourceType': resource_type,
+            'startDate': start_date,
+            'endDate': end_date,
+            'resources': list(resources),
+            'statuses': self.STATUSES,
+            'intervals': intervals,
+        }, status=status.HTTP_200_OK)
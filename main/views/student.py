@@ -22,9 +22,9 @@ class StudentFilter(django_filters.FilterSet):
 
 
 class StudentList(generics.ListCreateAPIView):
-    queryset = Student.objects.exclude(status='Archived').annotate(
+    queryset = StudentSerializer.setup_eager_loading(Student.objects.exclude(status='Archived').annotate(
         enrollment_date=Max('enrollment__enrollment_date')
-    )
+    ))
     serializer_class = StudentSerializer
     pagination_class = StandardResultsSetPagination
     filter_backends = (DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter)
@@ -38,7 +38,7 @@ class StudentList(generics.ListCreateAPIView):
 
 
 class StudentDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Student.objects.exclude(status='Archived')
+    queryset = StudentSerializer.setup_eager_loading(Student.objects.exclude(status='Archived'))
     serializer_class = StudentSerializer
     lookup_field = 'student_code'
     
@@ -46,11 +46,12 @@ class StudentDetail(generics.RetrieveUpdateDestroyAPIView):
 class StudentEnrollments(APIView):
     def get(self, request, identifier, *args, **kwargs):
         try:
+            students = StudentSerializer.setup_eager_loading(Student.objects.all())
             if '@' in identifier:
                 user = User.objects.get(email=identifier)
-                student = user.student
+                student = students.filter(user=user).first()
             else:
-                student = Student.objects.get(student_code=identifier)
+                student = students.get(student_code=identifier)
 
             if not student:
                 return Response({'error': 'Student not found'}, status=status.HTTP_400_BAD_REQUEST)
@@ -134,7 +134,7 @@ class RegisterView(APIView):
                 student.status = 'Active'
                 student.save()
 
-                serializer = StudentSerializer(student)
+                serializer = StudentSerializer(StudentSerializer.setup_eager_loading(Student.objects.all()).get(pk=student.pk))
                 return JsonResponse({
                     'success': 'Student account created successfully.', 'student': serializer.data
                 }, status=201)
@@ -1,11 +1,10 @@
-from datetime import datetime, time as dt_time
-from django.db.models import Q
 from rest_framework import generics
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from ..pagination import StandardResultsSetPagination
-from ..models import Vehicle, Session
+from ..models import Vehicle
 from ..serializers import VehicleSerializer
+from ..availability import parse_time_window, get_busy_facilities
 
 class VehicleList(generics.ListCreateAPIView):
     queryset = Vehicle.objects.all()
@@ -24,23 +23,12 @@ class VehicleList(generics.ListCreateAPIView):
         end_time = self.request.query_params.get('end_time', None)
 
         if date and start_time:
-            start_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
-            
-            if end_time:
-                end_datetime = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M")
-            else:
-                end_datetime = datetime.strptime(f"{date} 23:59", "%Y-%m-%d %H:%M")
-
-            busy_sessions = Session.objects.filter(
-                session_date=start_datetime.date(),
-                start_time__lt=end_datetime.time(),
-                end_time__gt=start_datetime.time(),
-                facility__facility_type='Vehicle'
-            ).values_list('facility__object_id', flat=True)
-
-            busy_vehicles = set(busy_sessions)
-
-            queryset = queryset.exclude(vehicle_code__in=busy_vehicles)
+            try:
+                session_date, start_time, end_time = parse_time_window(date, start_time, end_time)
+                busy_vehicles = get_busy_facilities(session_date, start_time, end_time, 'Vehicle')
+                queryset = queryset.exclude(vehicle_code__in=busy_vehicles)
+            except ValueError:
+                pass
 
         return queryset
 